@@ -19,6 +19,7 @@ The database is stored at the location specified by SQLITE_DB_PATH environment
 variable, or defaults to: BoxChooser/db/packing.db
 """
 
+import hashlib
 import json
 import logging
 import os
@@ -27,41 +28,87 @@ import secrets
 import sqlite3
 import string
 import sys
+import threading
+import time
+from collections import OrderedDict
 from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import bcrypt
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# bcrypt work factor for new PIN and password hashes. Existing hashes keep
+# the cost they were created with; lower it only for tests
+BCRYPT_COST = int(os.environ.get('BCRYPT_COST', '12'))
+
+
+def hash_secret(secret: str) -> bytes:
+    """Hash a PIN or password with bcrypt at BCRYPT_COST rounds"""
+    return bcrypt.hashpw(secret.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_COST))
+
 # Database management
 def get_db_path():
     """Get the database path from the environment variable or use the default."""
     default_path = str(Path(__file__).resolve().parent.parent / 'db' / 'packing.db')
     return os.environ.get('SQLITE_DB_PATH', default_path)
 
-@contextmanager
-def get_db():
-    """Get a database connection with automatic cleanup"""
-    db_path = get_db_path()
-    
+# One connection per thread, reused across requests so SQLite's page cache
+# stays warm; sqlite3 connections may not be shared between threads
+_thread_local = threading.local()
+
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    """Open a connection and apply the per-connection PRAGMAs"""
     # Ensure the directory exists
     db_dir = os.path.dirname(db_path)
     os.makedirs(db_dir, exist_ok=True)
     
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    # With WAL, NORMAL only syncs at checkpoints instead of on every commit;
+    # committed transactions stay durable across application crashes
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-8192')  # 8 MiB
+    return conn
+
+
+@contextmanager
+def get_db():
+    """Get this thread's database connection, rolling back anything left uncommitted"""
+    db_path = get_db_path()
+    
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is None or _thread_local.path != db_path:
+        if conn is not None:
+            conn.close()
+        conn = _open_connection(db_path)
+        _thread_local.conn = conn
+        _thread_local.path = db_path
+        _thread_local.depth = 0
+    
+    _thread_local.depth += 1
     try:
         yield conn
     finally:
-        conn.close()
+        _thread_local.depth -= 1
+        # Matches the old close-per-call behaviour: uncommitted work is
+        # discarded, and the next caller starts outside a transaction
+        if _thread_local.depth == 0 and conn.in_transaction:
+            conn.rollback()
 
 def init_db():
     """Initialize the database with required tables"""
     with get_db() as db:
+        # WAL lets readers proceed while another connection writes; the
+        # setting is stored in the database file, so once is enough
+        db.execute('PRAGMA journal_mode=WAL')
+        
         # Stores table - now with email and PIN
         db.execute('''
             CREATE TABLE IF NOT EXISTS store_auth (
@@ -99,6 +146,9 @@ def init_db():
             )
         ''')
         
+        # Expired-session cleanup runs on every login; index it as a range delete
+        db.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)')
+        
         # Custom box requests table - for tracking custom boxes added by stores
         db.execute('''
             CREATE TABLE IF NOT EXISTS custom_box_requests (
@@ -124,6 +174,13 @@ def init_db():
             )
         ''')
         
+        # Indexes for newest-first audit log reads (per store and overall)
+        db.execute('''
+            CREATE INDEX IF NOT EXISTS idx_audit_log_store_timestamp
+            ON audit_log(store_id, timestamp)
+        ''')
+        db.execute('CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp ON audit_log(timestamp)')
+        
         # Store-specific packing rules
         db.execute('''
             CREATE TABLE IF NOT EXISTS store_packing_rules (
@@ -327,7 +384,7 @@ def init_db():
         if not existing_demo:
             # Create demo store with a fixed PIN for demo purposes
             demo_pin = "123456"
-            demo_pin_hash = bcrypt.hashpw(demo_pin.encode('utf-8'), bcrypt.gensalt())
+            demo_pin_hash = hash_secret(demo_pin)
             
             db.execute(
                 "INSERT INTO store_auth (store_id, admin_email, pin_hash) VALUES (?, ?, ?)",
@@ -354,8 +411,9 @@ def generate_pin(length: int = 6) -> str:
     Returns:
         A numeric PIN string
     """
-    # Use secrets for cryptographic randomness
-    return ''.join(secrets.choice(string.digits) for _ in range(length))
+    # One draw from the OS CSPRNG covers every digit (secrets.choice per
+    # digit costs a urandom read each); zero-padding keeps it uniform
+    return str(secrets.randbelow(10 ** length)).zfill(length)
 
 def generate_email_code(length: int = 6) -> str:
     """
@@ -371,7 +429,40 @@ def generate_email_code(length: int = 6) -> str:
     chars = string.ascii_uppercase + string.digits
     # Avoid confusing characters
     chars = chars.replace('O', '').replace('0', '').replace('I', '').replace('1', '')
-    return ''.join(secrets.choice(chars) for _ in range(length))
+    # Draw one number below len(chars) ** length and read it off in base
+    # len(chars): uniform, with a single urandom read for the whole code
+    value = secrets.randbelow(len(chars) ** length)
+    code = []
+    for _ in range(length):
+        value, index = divmod(value, len(chars))
+        code.append(chars[index])
+    return ''.join(code)
+
+def _upsert_store_auth(db, store_id: str, admin_email: str, pin_hash: bytes) -> None:
+    """Create or update one store's auth row and audit it, without committing"""
+    # Update existing auth; the row count says whether there was any
+    cursor = db.execute(
+        """UPDATE store_auth 
+           SET admin_email = ?, pin_hash = ?, updated_at = CURRENT_TIMESTAMP
+           WHERE store_id = ?""",
+        (admin_email, pin_hash, store_id)
+    )
+    
+    if cursor.rowcount:
+        action = "auth_updated"
+    else:
+        # Create new
+        db.execute(
+            "INSERT INTO store_auth (store_id, admin_email, pin_hash) VALUES (?, ?, ?)",
+            (store_id, admin_email, pin_hash)
+        )
+        action = "store_created"
+    
+    # Log the action
+    db.execute(
+        "INSERT INTO audit_log (store_id, action) VALUES (?, ?)",
+        (store_id, action)
+    )
 
 def create_store_auth(store_id: str, admin_email: str, pin: Optional[str] = None) -> str:
     """
@@ -389,42 +480,42 @@ def create_store_auth(store_id: str, admin_email: str, pin: Optional[str] = None
         pin = generate_pin()
     
     # Hash the PIN
-    pin_hash = bcrypt.hashpw(pin.encode('utf-8'), bcrypt.gensalt())
+    pin_hash = hash_secret(pin)
     
     with get_db() as db:
-        # Check if store already has auth
-        existing = db.execute(
-            "SELECT * FROM store_auth WHERE store_id = ?", 
-            (store_id,)
-        ).fetchone()
-        
-        if existing:
-            # Update existing
-            db.execute(
-                """UPDATE store_auth 
-                   SET admin_email = ?, pin_hash = ?, updated_at = CURRENT_TIMESTAMP
-                   WHERE store_id = ?""",
-                (admin_email, pin_hash, store_id)
-            )
-            action = "auth_updated"
-        else:
-            # Create new
-            db.execute(
-                "INSERT INTO store_auth (store_id, admin_email, pin_hash) VALUES (?, ?, ?)",
-                (store_id, admin_email, pin_hash)
-            )
-            action = "store_created"
-        
-        # Log the action
-        db.execute(
-            "INSERT INTO audit_log (store_id, action) VALUES (?, ?)",
-            (store_id, action)
-        )
-        
+        _upsert_store_auth(db, store_id, admin_email, pin_hash)
         db.commit()
     
     return pin
 
+def create_store_auth_bulk(rows: List[Tuple[str, str]]) -> List[Tuple[str, str, str]]:
+    """
+    Create or update authentication for many stores in one transaction
+    
+    Args:
+        rows: (store_id, admin_email) pairs
+    
+    Returns:
+        (store_id, admin_email, pin) for each row, in input order
+    """
+    pins = [generate_pin() for _ in rows]
+    # bcrypt is the slow part; hash everything before taking the write lock
+    pin_hashes = [hash_secret(pin) for pin in pins]
+    
+    with get_db() as db:
+        for (store_id, admin_email), pin_hash in zip(rows, pin_hashes):
+            _upsert_store_auth(db, store_id, admin_email, pin_hash)
+        # One commit (and one WAL sync) for the whole batch; an error above
+        # leaves nothing written since get_db rolls back on the way out
+        db.commit()
+    
+    return [(store_id, admin_email, pin) for (store_id, admin_email), pin in zip(rows, pins)]
+
+@lru_cache(maxsize=1)
+def _dummy_pin_hash() -> bytes:
+    """Hash checked against when a store has no PIN; built on first use"""
+    return hash_secret('000000')
+
 def verify_pin(store_id: str, pin: str) -> bool:
     """
     Verify a PIN for a store
@@ -443,6 +534,9 @@ def verify_pin(store_id: str, pin: str) -> bool:
         ).fetchone()
         
         if not result:
+            # Spend the same bcrypt time as a wrong PIN so response timing
+            # does not reveal which store IDs have auth configured
+            bcrypt.checkpw(pin.encode('utf-8'), _dummy_pin_hash())
             return False
         
         is_valid = bcrypt.checkpw(
@@ -598,6 +692,37 @@ def create_session(store_id: str, auth_level: str = "user", hours: Optional[int]
     
     return token
 
+# Verified sessions keyed by SHA-256 of the token, so authenticated requests
+# skip the sessions lookup. Entries never outlive the session itself and
+# delete_session evicts; SESSION_CACHE_TTL=0 disables caching
+_SESSION_CACHE_TTL = float(os.environ.get('SESSION_CACHE_TTL', '60'))
+_SESSION_CACHE_MAX = 10000
+_session_cache: "OrderedDict[bytes, Tuple[Tuple[str, str], float]]" = OrderedDict()
+_session_cache_lock = threading.Lock()
+
+
+def _session_cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+def get_cached_session(token: str) -> Optional[Tuple[str, str]]:
+    """
+    Cache-only variant of verify_session; never touches the database
+    
+    Returns:
+        Tuple of (store_id, auth_level) if cached, None otherwise
+    """
+    key = _session_cache_key(token)
+    with _session_cache_lock:
+        cached = _session_cache.get(key)
+        if cached is not None:
+            if time.monotonic() < cached[1]:
+                _session_cache.move_to_end(key)
+                return cached[0]
+            del _session_cache[key]
+    return None
+
+
 def verify_session(token: str) -> Optional[Tuple[str, str]]:
     """
     Verify a session token and return the store_id and auth_level if valid
@@ -608,17 +733,52 @@ def verify_session(token: str) -> Optional[Tuple[str, str]]:
     Returns:
         Tuple of (store_id, auth_level) if valid, None otherwise
     """
+    cached = get_cached_session(token)
+    if cached is not None:
+        return cached
+    
+    now = time.monotonic()
     with get_db() as db:
         result = db.execute(
-            """SELECT store_id, auth_level FROM sessions 
+            """SELECT store_id, auth_level,
+                      (julianday(expires_at) - julianday('now')) * 86400 AS remaining
+               FROM sessions 
                WHERE token = ? AND expires_at > CURRENT_TIMESTAMP""",
             (token,)
         ).fetchone()
-        
-        if result:
-            return (result['store_id'], result['auth_level'])
-        
+    
+    if not result:
         return None
+    
+    session = (result['store_id'], result['auth_level'])
+    
+    if _SESSION_CACHE_TTL > 0 and result['remaining']:
+        expires = now + min(_SESSION_CACHE_TTL, result['remaining'])
+        key = _session_cache_key(token)
+        with _session_cache_lock:
+            _session_cache[key] = (session, expires)
+            _session_cache.move_to_end(key)
+            while len(_session_cache) > _SESSION_CACHE_MAX:
+                _session_cache.popitem(last=False)
+    
+    return session
+
+def get_store_status(store_id: str) -> Optional[str]:
+    """
+    Get a store's status ('active', 'disabled', ...)
+    
+    Not cached, so disabling a store takes effect on the next request.
+    
+    Returns:
+        The status, or None if the store has no auth row
+    """
+    with get_db() as db:
+        result = db.execute(
+            "SELECT status FROM store_auth WHERE store_id = ?",
+            (store_id,)
+        ).fetchone()
+    
+    return result['status'] if result else None
 
 def get_session_info(token: str) -> Optional[dict]:
     """
@@ -630,21 +790,17 @@ def get_session_info(token: str) -> Optional[dict]:
     Returns:
         Dict with session info if valid, None otherwise
     """
-    with get_db() as db:
-        result = db.execute(
-            """SELECT store_id, auth_level FROM sessions 
-               WHERE token = ? AND expires_at > CURRENT_TIMESTAMP""",
-            (token,)
-        ).fetchone()
-        
-        if result:
-            return {
-                'store_id': result['store_id'],
-                'auth_level': result['auth_level'],
-                'is_demo': result['store_id'] == '999999'  # Demo store ID
-            }
-        
-        return None
+    result = verify_session(token)
+    
+    if result:
+        store_id, auth_level = result
+        return {
+            'store_id': store_id,
+            'auth_level': auth_level,
+            'is_demo': store_id == '999999'  # Demo store ID
+        }
+    
+    return None
 
 def delete_session(token: str):
     """Delete a session (logout)"""
@@ -668,14 +824,27 @@ def delete_session(token: str):
             )
             
             db.commit()
+    
+    # Evict after the delete commits so a concurrent lookup cannot re-cache it
+    with _session_cache_lock:
+        _session_cache.pop(_session_cache_key(token), None)
 
-def list_stores() -> List[Dict]:
-    """List all stores with auth configured"""
+def list_stores(limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+    """
+    List stores with auth configured, ordered by store ID
+    
+    Args:
+        limit: Maximum number of stores to return (None for all)
+        offset: Number of stores to skip
+    """
     with get_db() as db:
+        # SQLite treats a negative LIMIT as "no limit"
         results = db.execute(
-            """SELECT store_id, created_at, updated_at 
+            """SELECT store_id, admin_email, created_at, updated_at 
                FROM store_auth 
-               ORDER BY store_id"""
+               ORDER BY store_id
+               LIMIT ? OFFSET ?""",
+            (-1 if limit is None else limit, offset)
         ).fetchall()
         
         return [dict(row) for row in results]
@@ -690,31 +859,56 @@ def hasAuth(store_id: str) -> bool:
         
         return result is not None
 
-def get_audit_log(store_id: Optional[str] = None, limit: int = 100) -> List[Dict]:
+def iter_audit_log(store_id: Optional[str] = None, limit: int = 100,
+                   before: Optional[Tuple[str, int]] = None) -> Iterator[Dict]:
     """
-    Get audit log entries
+    Yield audit log entries, newest first, as SQLite produces them
+    
+    Rows are not collected into a list first, so callers can start
+    printing immediately and only hold one row at a time.
     
     Args:
         store_id: Optional filter by store
         limit: Maximum number of entries to return
+        before: Optional (timestamp, id) of the last entry already seen;
+            only older entries are returned (keyset pagination, so later
+            pages cost the same as the first)
+    
+    Yields:
+        Audit log entries
+    """
+    conditions = []
+    params: List = []
+    if store_id:
+        conditions.append("store_id = ?")
+        params.append(store_id)
+    if before is not None:
+        # id breaks ties between entries logged in the same second; the
+        # timestamp indexes already end in the rowid, so this is a seek
+        conditions.append("(timestamp, id) < (?, ?)")
+        params.extend(before)
+    
+    query = "SELECT * FROM audit_log"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+    params.append(limit)
+    
+    with get_db() as db:
+        for row in db.execute(query, params):
+            yield dict(row)
+
+def get_audit_log(store_id: Optional[str] = None, limit: int = 100,
+                  before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+    """
+    Get audit log entries, newest first
+    
+    See iter_audit_log for the arguments.
     
     Returns:
         List of audit log entries
     """
-    with get_db() as db:
-        if store_id:
-            query = """SELECT * FROM audit_log 
-                      WHERE store_id = ? 
-                      ORDER BY timestamp DESC 
-                      LIMIT ?"""
-            results = db.execute(query, (store_id, limit)).fetchall()
-        else:
-            query = """SELECT * FROM audit_log 
-                      ORDER BY timestamp DESC 
-                      LIMIT ?"""
-            results = db.execute(query, (limit,)).fetchall()
-        
-        return [dict(row) for row in results]
+    return list(iter_audit_log(store_id, limit, before))
 
 def get_store_info(store_id: str) -> Optional[Dict]:
     """Get store authentication info"""
@@ -731,7 +925,7 @@ def get_store_info(store_id: str) -> Optional[Dict]:
 def regenerate_pin(store_id: str) -> str:
     """Regenerate PIN for a store"""
     new_pin = generate_pin()
-    pin_hash = bcrypt.hashpw(new_pin.encode('utf-8'), bcrypt.gensalt())
+    pin_hash = hash_secret(new_pin)
     
     with get_db() as db:
         db.execute(
@@ -6,28 +6,57 @@ See docs/authentication-api-patterns.md for the required authentication patterns
 """
 
 from fastapi import Depends, HTTPException, status, Request
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPBearer
 from typing import Optional, Tuple
 from backend.lib import auth_manager
 
-# Bearer token security scheme
-bearer_scheme = HTTPBearer(auto_error=False)
+class _BearerToken(HTTPBearer):
+    """
+    Bearer security scheme that returns the raw token string, or None
+
+    Subclassing HTTPBearer keeps the scheme in the OpenAPI docs while the
+    header is parsed directly instead of building a credentials object.
+    """
+    async def __call__(self, request: Request) -> Optional[str]:
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        return token
+
+# Bearer token security scheme (shared by every auth dependency)
+bearer_scheme = _BearerToken(scheme_name="HTTPBearer", auto_error=False)
+
+def _not_authenticated() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def _verify_session(token: str) -> Optional[Tuple[str, str]]:
+    """
+    Look up (store_id, auth_level) for a token, leaving the event loop only
+    when the session cache misses and SQLite is needed
+    """
+    result = auth_manager.get_cached_session(token)
+    if result is None:
+        result = await run_in_threadpool(auth_manager.verify_session, token)
+    return result
 
-def _get_current_auth_impl(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+async def _get_current_auth_impl(
+    token: Optional[str] = Depends(bearer_scheme)
 ) -> Tuple[str, str]:
     """
     Implementation that verifies Bearer token and returns (store_id, auth_level)
     """
-    if not credentials:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if not token:
+        raise _not_authenticated()
     
-    token = credentials.credentials
-    result = auth_manager.verify_session(token)
+    result = await _verify_session(token)
     
     if not result:
         raise HTTPException(
@@ -38,20 +67,16 @@ def _get_current_auth_impl(
     
     store_id, auth_level = result
     
-    # Check if store is disabled (unless it's a superadmin)
+    # Check if store is disabled (unless it's a superadmin). The status is
+    # read on every request rather than cached with the session, so a store
+    # disabled from another process is locked out immediately
     if auth_level != 'superadmin':
-        from backend.lib.auth_manager import get_db
-        with get_db() as db:
-            store = db.execute(
-                "SELECT status FROM store_auth WHERE store_id = ?",
-                (store_id,)
-            ).fetchone()
-            
-            if store and store['status'] != 'active':
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Store is disabled"
-                )
+        store_status = await run_in_threadpool(auth_manager.get_store_status, store_id)
+        if store_status is not None and store_status != 'active':
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Store is disabled"
+            )
     
     return result
 
@@ -64,6 +89,30 @@ def get_current_auth():
     """
     return _get_current_auth_impl
 
+async def _get_current_admin_impl(
+    auth_info: Tuple[str, str] = Depends(_get_current_auth_impl)
+) -> Tuple[str, str]:
+    """
+    Implementation that additionally requires the 'admin' auth level
+    """
+    if auth_info[1] != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return auth_info
+
+def get_current_admin():
+    """
+    Verify Bearer token, require admin access and return (store_id, auth_level)
+    
+    Raises:
+        HTTPException: If token is invalid or expired (401) or the session
+            is not an admin session (403)
+    """
+    return _get_current_admin_impl
+
 def get_current_auth_with_demo():
     """
     Verify Bearer token and return full session info including is_demo
@@ -72,9 +121,11 @@ def get_current_auth_with_demo():
         HTTPException: If token is invalid or expired
     """
     def _get_current_auth_with_demo_impl(
-        credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+        token: Optional[str] = Depends(bearer_scheme)
     ) -> dict:
-        token = credentials.credentials
+        if not token:
+            raise _not_authenticated()
+        
         result = auth_manager.get_session_info(token)
         
         if not result:
@@ -88,8 +139,8 @@ def get_current_auth_with_demo():
     
     return Depends(_get_current_auth_with_demo_impl)
 
-def get_current_store(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+async def get_current_store(
+    token: Optional[str] = Depends(bearer_scheme)
 ) -> str:
     """
     Verify Bearer token and return the store_id
@@ -98,15 +149,10 @@ def get_current_store(
     Raises:
         HTTPException: If token is invalid or expired
     """
-    if not credentials:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if not token:
+        raise _not_authenticated()
     
-    token = credentials.credentials
-    result = auth_manager.verify_session(token)
+    result = await _verify_session(token)
     
     if not result:
         raise HTTPException(
@@ -126,16 +172,14 @@ def get_optional_auth() -> Optional[Tuple[str, str]]:
     
     This is useful for endpoints that behave differently when authenticated
     """
-    def _get_optional_auth(
-        request: Request,
-        credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+    async def _get_optional_auth(
+        token: Optional[str] = Depends(bearer_scheme)
     ) -> Optional[Tuple[str, str]]:
-        if not credentials:
+        if not token:
             return None
         
         try:
-            token = credentials.credentials
-            return auth_manager.verify_session(token)
+            return await _verify_session(token)
         except:
             return None
     
@@ -146,14 +190,12 @@ def get_optional_auth_with_demo() -> Optional[dict]:
     Get full session info including is_demo flag if authenticated, None otherwise
     """
     def _get_optional_auth_with_demo(
-        request: Request,
-        credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+        token: Optional[str] = Depends(bearer_scheme)
     ) -> Optional[dict]:
-        if not credentials:
+        if not token:
             return None
         
         try:
-            token = credentials.credentials
             return auth_manager.get_session_info(token)
         except:
             return None
@@ -171,7 +213,7 @@ def get_current_superadmin():
     Raises:
         HTTPException: If token is invalid, expired, or user is not a superadmin
     """
-    def _get_current_superadmin_impl(
+    async def _get_current_superadmin_impl(
         auth_info: Tuple[str, str] = Depends(_get_current_auth_impl)
     ) -> Tuple[str, str]:
         store_id, auth_level = auth_info
@@ -1,21 +1,46 @@
 """Box library management - vendor-agnostic box catalog"""
 import logging
+import math
 import os
 import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import yaml
 
+from backend.lib.http_cache import encode_json, make_etag
+from backend.lib.yaml_helpers import load_yaml
+
 logger = logging.getLogger(__name__)
 
+# Edge length (inches) of the grid cells used to index box dimensions
+_GRID_CELL_SIZE = 1.0
+
+# Decimal places kept when canonicalizing dimensions for exact lookups.
+# Library sizes go down to eighths of an inch (e.g. 15.125), so 3 places
+# keeps every distinct size distinct while absorbing float noise.
+_EXACT_PRECISION = 3
+
 
 class BoxLibrary:
     """Manages the unified box library (vendor-agnostic)"""
     
     def __init__(self):
         self.boxes: List[dict] = []
+        # Sorted (largest first) dimensions for each box, parallel to self.boxes
+        self._dims: List[Tuple[float, ...]] = []
+        # Grid cell -> indexes of boxes whose sorted dimensions fall in that cell
+        self._grid: Dict[Tuple[int, ...], List[int]] = {}
+        # Canonical (dimensions, alternate depths) -> first matching box
+        self._exact: Dict[Tuple[Tuple[float, ...], Tuple[float, ...]], dict] = {}
+        # Canonical dimensions -> indexes of every box with those dimensions
+        self._by_dims: Dict[Tuple[float, ...], List[int]] = {}
         self._load_library()
+        self._build_index()
+        # Serialized library and its ETag, built once per load so GET requests
+        # don't re-encode the whole catalog
+        self.boxes_json: bytes = encode_json(self.boxes)
+        self.boxes_etag: str = make_etag(self.boxes_json)
     
     def _load_library(self):
         """Load the box library from boxes/library.yml"""
@@ -29,7 +54,7 @@ class BoxLibrary:
         
         try:
             with open(library_path, 'r') as f:
-                library_data = yaml.safe_load(f)
+                library_data = load_yaml(f)
             
             if library_data and 'boxes' in library_data:
                 self.boxes = library_data['boxes']
@@ -42,7 +67,55 @@ class BoxLibrary:
         except Exception as e:
             logger.error(f"Error loading box library: {e}")
     
+    def _build_index(self):
+        """Bucket boxes on a uniform grid and index them for exact lookups"""
+        for idx, box in enumerate(self.boxes):
+            dims = tuple(sorted(box['dimensions'], reverse=True))
+            self._dims.append(dims)
+            self._grid.setdefault(self._grid_cell(dims), []).append(idx)
+            
+            dims_key = self._canonical(dims)
+            self._by_dims.setdefault(dims_key, []).append(idx)
+            # First box in library order wins, matching the old linear scan
+            depths_key = self._canonical(box.get('alternate_depths') or [])
+            self._exact.setdefault((dims_key, depths_key), box)
+    
+    @staticmethod
+    def _canonical(values: Iterable[float]) -> Tuple[float, ...]:
+        """Sorted (largest first), rounded tuple used as an exact-match key"""
+        return tuple(sorted((round(v, _EXACT_PRECISION) for v in values), reverse=True))
     
+    @staticmethod
+    def _grid_cell(dims: Iterable[float]) -> Tuple[int, ...]:
+        """Grid cell containing the given (sorted) dimensions"""
+        return tuple(math.floor(d / _GRID_CELL_SIZE) for d in dims)
+    
+    def _candidates(self, dims_sorted: List[float], tolerance: float) -> List[int]:
+        """
+        Indexes of boxes that may lie within tolerance of the given dimensions
+        
+        Only the grid cells overlapping the tolerance window are visited, so the
+        cost depends on the window size rather than the library size.
+        """
+        ranges = [
+            range(math.floor((d - tolerance) / _GRID_CELL_SIZE),
+                  math.floor((d + tolerance) / _GRID_CELL_SIZE) + 1)
+            for d in dims_sorted
+        ]
+        
+        # A window wider than the library is cheaper to scan directly
+        if len(ranges[0]) * len(ranges[1]) * len(ranges[2]) > len(self.boxes):
+            return list(range(len(self.boxes)))
+        
+        candidates = []
+        for x in ranges[0]:
+            for y in ranges[1]:
+                for z in ranges[2]:
+                    candidates.extend(self._grid.get((x, y, z), ()))
+        
+        # Keep library order so results are stable
+        candidates.sort()
+        return candidates
     
     def find_exact_match(self, dimensions: List[float], 
                         alternate_depths: Optional[List[float]] = None) -> Optional[dict]:
@@ -56,25 +129,8 @@ class BoxLibrary:
         Returns:
             Matching box or None
         """
-        # Normalize inputs
-        dims_sorted = sorted(dimensions, reverse=True)
-        depths_sorted = sorted(alternate_depths or [], reverse=True)
-        
-        for box in self.boxes:
-            box_dims = sorted(box['dimensions'], reverse=True)
-            box_depths = sorted(box.get('alternate_depths', []), reverse=True)
-            
-            # Check dimensions match
-            if box_dims != dims_sorted:
-                continue
-            
-            # Check alternate depths match
-            if depths_sorted != box_depths:
-                continue
-            
-            return box
-        
-        return None
+        key = (self._canonical(dimensions), self._canonical(alternate_depths or []))
+        return self._exact.get(key)
     
     def find_all_by_dimensions(self, dimensions: List[float]) -> List[dict]:
         """
@@ -87,22 +143,20 @@ class BoxLibrary:
             List of all boxes with these exact dimensions
         """
         results = []
-        dims_sorted = sorted(dimensions, reverse=True)
         
-        for box in self.boxes:
-            box_dims = sorted(box['dimensions'], reverse=True)
+        for idx in self._by_dims.get(self._canonical(dimensions), ()):
+            box = self.boxes[idx]
+            box_dims = self._dims[idx]
             
-            # Check if dimensions match exactly
-            if box_dims == dims_sorted:
-                # Add formatted string for display
-                box_copy = box.copy()
-                if box.get('alternate_depths'):
-                    depths_str = ", ".join(str(d) for d in box['alternate_depths'])
-                    box_copy['display_name'] = f"{box_dims[0]}x{box_dims[1]}x{box_dims[2]} (prescored: {depths_str})"
-                else:
-                    box_copy['display_name'] = f"{box_dims[0]}x{box_dims[1]}x{box_dims[2]} (no prescoring)"
-                box_copy['dimensions_str'] = "x".join(str(d) for d in box_dims)
-                results.append(box_copy)
+            # Add formatted string for display
+            box_copy = box.copy()
+            if box.get('alternate_depths'):
+                depths_str = ", ".join(str(d) for d in box['alternate_depths'])
+                box_copy['display_name'] = f"{box_dims[0]}x{box_dims[1]}x{box_dims[2]} (prescored: {depths_str})"
+            else:
+                box_copy['display_name'] = f"{box_dims[0]}x{box_dims[1]}x{box_dims[2]} (no prescoring)"
+            box_copy['dimensions_str'] = "x".join(str(d) for d in box_dims)
+            results.append(box_copy)
         
         return results
     
@@ -118,21 +172,23 @@ class BoxLibrary:
             List of similar boxes sorted by total dimension difference
         """
         results = []
-        target_sorted = sorted(dimensions, reverse=True)
+        t0, t1, t2 = sorted(dimensions, reverse=True)
+        dims = self._dims
         
-        for box in self.boxes:
-            box_dims = sorted(box['dimensions'], reverse=True)
+        for idx in self._candidates([t0, t1, t2], tolerance):
+            # Work on the parallel dimension tuples; box dicts are only touched for hits
+            b0, b1, b2 = dims[idx]
+            d0, d1, d2 = abs(b0 - t0), abs(b1 - t1), abs(b2 - t2)
             
             # Calculate max difference
-            max_diff = max(abs(box_dims[i] - target_sorted[i]) for i in range(3))
+            max_diff = max(d0, d1, d2)
             
             if max_diff <= tolerance:
-                # Calculate total difference for sorting
-                total_diff = sum(abs(box_dims[i] - target_sorted[i]) for i in range(3))
                 results.append({
-                    'box': box,
+                    'box': self.boxes[idx],
                     'max_diff': max_diff,
-                    'total_diff': total_diff
+                    # Total difference for sorting
+                    'total_diff': d0 + d1 + d2
                 })
         
         # Sort by total difference
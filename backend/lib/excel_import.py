@@ -3,19 +3,158 @@ Excel import/export functionality for box prices.
 Handles all Excel-related operations using openpyxl.
 """
 
+import asyncio
+import hashlib
 import json
+import multiprocessing
 import os
 import re
 import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 from fastapi import HTTPException, UploadFile
 from fastapi.responses import FileResponse
 from openpyxl import Workbook, load_workbook
 from openpyxl.utils import get_column_letter
 
-from backend.lib.box_library import BoxLibrary
+from backend.lib.box_library import get_box_library
+
+# Matches box dimensions in product names, e.g. "10x10x10" or "17.5 X 15.125 x 3.25"
+DIMENSION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)')
+
+# Upload size limit (512KB for production)
+MAX_FILE_SIZE = 512 * 1024
+UPLOAD_CHUNK_SIZE = 8192  # 8KB chunks
+
+# openpyxl is pure Python, so workbook parsing runs in worker processes to keep
+# the event loop (and other requests) responsive. Defaults to one worker per CPU;
+# override with EXCEL_IMPORT_WORKERS.
+_EXCEL_WORKERS = int(os.environ.get('EXCEL_IMPORT_WORKERS', str(os.cpu_count() or 1)))
+_excel_pool: Optional[ProcessPoolExecutor] = None
+_excel_pool_lock = threading.Lock()
+
+
+def _get_excel_pool() -> ProcessPoolExecutor:
+    """Get or create the worker pool used for Excel parsing (thread-safe)"""
+    global _excel_pool
+    if _excel_pool is None:
+        with _excel_pool_lock:
+            if _excel_pool is None:
+                # spawn: forking a process that already runs threads is unsafe
+                _excel_pool = ProcessPoolExecutor(
+                    max_workers=_EXCEL_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _excel_pool
+
+
+def shutdown_excel_pool():
+    """Stop the Excel worker pool, if it was started"""
+    global _excel_pool
+    with _excel_pool_lock:
+        if _excel_pool is not None:
+            _excel_pool.shutdown(wait=False, cancel_futures=True)
+            _excel_pool = None
+
+
+async def _run_in_excel_pool(func, *args):
+    """Run a module-level function in the Excel worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_excel_pool(), func, *args)
+
+
+# Parsed price sheets from /import/analyze, keyed by (store_id, file hash), so
+# re-analyzing the same sheet and /import/excel-items skip openpyxl entirely.
+# TTL defaults to 15 minutes; override with IMPORT_ANALYSIS_TTL (seconds).
+_ANALYSIS_CACHE_TTL = int(os.environ.get('IMPORT_ANALYSIS_TTL', '900'))
+_ANALYSIS_CACHE_SIZE = 128
+_analysis_cache: "OrderedDict[Tuple[str, str], Tuple[float, dict]]" = OrderedDict()
+_latest_analysis: Dict[str, str] = {}  # store_id -> most recent analysis_id
+_analysis_cache_lock = threading.Lock()
+
+
+def _cache_price_sheet(store_id: str, analysis_id: str, sheet: dict):
+    """Store a parsed price sheet, evicting the oldest entries beyond the size limit"""
+    with _analysis_cache_lock:
+        _analysis_cache[(store_id, analysis_id)] = (time.monotonic(), sheet)
+        _analysis_cache.move_to_end((store_id, analysis_id))
+        _latest_analysis[store_id] = analysis_id
+        while len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+
+def get_cached_price_sheet(store_id: str, analysis_id: Optional[str] = None) -> Optional[dict]:
+    """
+    Get a parsed price sheet from a recent /import/analyze call
+    
+    Args:
+        store_id: Store the sheet was analyzed for
+        analysis_id: Hash returned by the analysis; defaults to the store's latest
+        
+    Returns:
+        Parsed sheet ('rows', 'groups', 'groups_exact') or None if not cached
+    """
+    with _analysis_cache_lock:
+        if analysis_id is None:
+            analysis_id = _latest_analysis.get(store_id)
+            if analysis_id is None:
+                return None
+        
+        entry = _analysis_cache.get((store_id, analysis_id))
+        if entry is None:
+            return None
+        
+        cached_at, sheet = entry
+        if time.monotonic() - cached_at > _ANALYSIS_CACHE_TTL:
+            del _analysis_cache[(store_id, analysis_id)]
+            return None
+        
+        _analysis_cache.move_to_end((store_id, analysis_id))
+        return sheet
+
+
+async def _save_upload_to_temp(file: UploadFile) -> Tuple[str, str]:
+    """
+    Validate an uploaded Excel file and stream it to a temp file
+    
+    Returns:
+        Tuple of (temp file path, content hash); the caller is responsible
+        for deleting the file
+        
+    Raises:
+        HTTPException: If the file is not an Excel file or exceeds MAX_FILE_SIZE
+    """
+    # Validate file type
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
+    
+    # Stream file to temp location to avoid loading into memory
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
+    hasher = hashlib.blake2b(digest_size=16)
+    try:
+        total_size = 0
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            total_size += len(chunk)
+            if total_size > MAX_FILE_SIZE:
+                raise HTTPException(status_code=400, detail="File size exceeds 512KB limit")
+            temp_file.write(chunk)
+            hasher.update(chunk)
+    except BaseException:
+        temp_file.close()
+        os.unlink(temp_file.name)
+        raise
+    
+    temp_file.close()
+    await file.seek(0)  # Reset file pointer
+    return temp_file.name, hasher.hexdigest()
 
 
 def export_prices_to_excel(store_id: str, store_data: dict) -> FileResponse:
@@ -96,6 +235,85 @@ def export_prices_to_excel(store_id: str, store_data: dict) -> FileResponse:
     )
 
 
+def _apply_price_sheet(path: str, current_data: dict) -> Tuple[int, List[str], dict]:
+    """
+    Apply prices from a workbook to store data (runs in the Excel worker pool)
+    
+    Returns:
+        Tuple of (updated count, row errors, updated store data)
+    """
+    # Read Excel file with minimal memory usage
+    wb = load_workbook(path, read_only=True, keep_vba=False, data_only=True)
+    ws = wb.active
+    
+    # Get headers from first row
+    headers = {}
+    for col_idx, cell in enumerate(ws[1], 1):
+        if cell.value:
+            headers[cell.value] = col_idx
+    
+    # Create a mapping of models to boxes for faster lookup
+    box_map = {}
+    for i, box in enumerate(current_data["boxes"]):
+        model = box.get("model", f"Unknown-{len(box['dimensions'])}")
+        box_map[model] = i
+    
+    # Process imported data
+    updated_count = 0
+    errors = []
+    
+    for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
+        try:
+            # Get model from row
+            model_col = headers.get("Model")
+            if not model_col or row_idx > ws.max_row:
+                break
+                
+            model = str(row[model_col - 1] if row[model_col - 1] else "")
+            if not model:
+                continue
+                
+            if model not in box_map:
+                errors.append(f"Row {row_idx}: Model '{model}' not found in store")
+                continue
+            
+            box_idx = box_map[model]
+            box = current_data["boxes"][box_idx]
+            
+            # Update itemized prices
+            if "itemized-prices" not in box:
+                box["itemized-prices"] = {}
+            
+            ip = box["itemized-prices"]
+            
+            # Map header names to price fields
+            field_map = {
+                "Box Price": "box-price",
+                "Standard Materials": "standard-materials",
+                "Standard Services": "standard-services",
+                "Fragile Materials": "fragile-materials",
+                "Fragile Services": "fragile-services",
+                "Custom Materials": "custom-materials",
+                "Custom Services": "custom-services"
+            }
+            
+            for header_name, field_name in field_map.items():
+                if header_name in headers:
+                    val = row[headers[header_name] - 1]
+                    if val is not None:
+                        ip[field_name] = float(val)
+            
+            updated_count += 1
+            
+        except Exception as e:
+            errors.append(f"Row {row_idx}: {str(e)}")
+    
+    # Close workbook
+    wb.close()
+    
+    return updated_count, errors, current_data
+
+
 async def import_prices_from_excel(
     store_id: str, 
     file: UploadFile, 
@@ -103,112 +321,15 @@ async def import_prices_from_excel(
     save_yaml_func
 ) -> dict:
     """Import prices from Excel file"""
-    
-    # Validate file type
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
-    
-    # Check file size (512KB limit for production)
-    MAX_FILE_SIZE = 512 * 1024  # 512KB
-    
-    # Stream file to temp location to avoid loading into memory
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
+    temp_path, _ = await _save_upload_to_temp(file)
     try:
-        # Stream file content to temp file in chunks
-        total_size = 0
-        chunk_size = 8192  # 8KB chunks
-        
-        while True:
-            chunk = await file.read(chunk_size)
-            if not chunk:
-                break
-            total_size += len(chunk)
-            if total_size > MAX_FILE_SIZE:
-                temp_file.close()
-                os.unlink(temp_file.name)
-                raise HTTPException(status_code=400, detail="File size exceeds 512KB limit")
-            temp_file.write(chunk)
-        
-        temp_file.close()
-        await file.seek(0)  # Reset file pointer
-        
-        # Read Excel file with minimal memory usage
-        wb = load_workbook(temp_file.name, read_only=True, keep_vba=False, data_only=True)
-        ws = wb.active
-        
-        # Load current store data
-        
-        # Get headers from first row
-        headers = {}
-        for col_idx, cell in enumerate(ws[1], 1):
-            if cell.value:
-                headers[cell.value] = col_idx
-        
-        # Create a mapping of models to boxes for faster lookup
-        box_map = {}
-        for i, box in enumerate(current_data["boxes"]):
-            model = box.get("model", f"Unknown-{len(box['dimensions'])}")
-            box_map[model] = i
-        
-        # Process imported data
-        updated_count = 0
-        errors = []
-        
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
-            try:
-                # Get model from row
-                model_col = headers.get("Model")
-                if not model_col or row_idx > ws.max_row:
-                    break
-                    
-                model = str(row[model_col - 1] if row[model_col - 1] else "")
-                if not model:
-                    continue
-                    
-                if model not in box_map:
-                    errors.append(f"Row {row_idx}: Model '{model}' not found in store")
-                    continue
-                
-                box_idx = box_map[model]
-                box = current_data["boxes"][box_idx]
-                
-                # Update itemized prices
-                if "itemized-prices" not in box:
-                    box["itemized-prices"] = {}
-                
-                ip = box["itemized-prices"]
-                
-                # Map header names to price fields
-                field_map = {
-                    "Box Price": "box-price",
-                    "Standard Materials": "standard-materials",
-                    "Standard Services": "standard-services",
-                    "Fragile Materials": "fragile-materials",
-                    "Fragile Services": "fragile-services",
-                    "Custom Materials": "custom-materials",
-                    "Custom Services": "custom-services"
-                }
-                
-                for header_name, field_name in field_map.items():
-                    if header_name in headers:
-                        val = row[headers[header_name] - 1]
-                        if val is not None:
-                            ip[field_name] = float(val)
-                
-                updated_count += 1
-                
-            except Exception as e:
-                errors.append(f"Row {row_idx}: {str(e)}")
-        
-        # Close workbook
-        wb.close()
+        updated_count, errors, updated_data = await _run_in_excel_pool(
+            _apply_price_sheet, temp_path, current_data
+        )
         
         # Save updated data
         if updated_count > 0:
-            save_yaml_func(store_id, current_data)
-        
-        # Clean up temp file
-        os.unlink(temp_file.name)
+            save_yaml_func(store_id, updated_data)
         
         return {
             "message": f"Successfully updated {updated_count} box prices",
@@ -217,202 +338,175 @@ async def import_prices_from_excel(
         }
         
     except Exception as e:
-        # Clean up temp file on error
-        if os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+    finally:
+        # Clean up temp file
+        os.unlink(temp_path)
 
 
-async def analyze_excel_structure(file: UploadFile) -> dict:
-    """Analyze Excel file structure for import preview"""
-    
-    # Validate file type
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
-    
-    # Check file size (512KB limit for production)
-    MAX_FILE_SIZE = 512 * 1024  # 512KB
+def _analyze_workbook_structure(path: str, filename: str) -> dict:
+    """Analyze workbook structure and save a digest (runs in the Excel worker pool)"""
+    # Read Excel file info with minimal memory usage
+    wb = load_workbook(path, read_only=True, data_only=True, keep_vba=False)
+    sheets_info = []
     
-    # Stream file to temp location to avoid loading into memory
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
-    try:
-        # Stream file content to temp file in chunks
-        total_size = 0
-        chunk_size = 8192  # 8KB chunks
+    for sheet_name in wb.sheetnames:
+        ws = wb[sheet_name]
         
-        while True:
-            chunk = await file.read(chunk_size)
-            if not chunk:
+        # Get headers from first row
+        headers = []
+        for cell in ws[1]:
+            headers.append(cell.value if cell.value else f"Column{cell.column}")
+        
+        # Collect data and analyze
+        data_rows = []
+        column_data = {header: [] for header in headers}
+        
+        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
+            if row_idx > 51:  # Limit to first 50 data rows for sample
                 break
-            total_size += len(chunk)
-            if total_size > MAX_FILE_SIZE:
-                temp_file.close()
-                os.unlink(temp_file.name)
-                raise HTTPException(status_code=400, detail="File size exceeds 512KB limit")
-            temp_file.write(chunk)
+            
+            row_data = {}
+            for col_idx, value in enumerate(row):
+                if col_idx < len(headers):
+                    header = headers[col_idx]
+                    row_data[header] = value
+                    column_data[header].append(value)
+            
+            if any(v is not None for v in row):  # Skip completely empty rows
+                data_rows.append(row_data)
         
-        temp_file.close()
-        await file.seek(0)  # Reset file pointer
+        # Analyze all rows for statistics
+        all_column_data = {header: [] for header in headers}
+        total_rows = 0
         
-        # Read Excel file info with minimal memory usage
-        wb = load_workbook(temp_file.name, read_only=True, data_only=True, keep_vba=False)
-        sheets_info = []
+        for row in ws.iter_rows(min_row=2, values_only=True):
+            total_rows += 1
+            for col_idx, value in enumerate(row):
+                if col_idx < len(headers):
+                    all_column_data[headers[col_idx]].append(value)
+        
+        # Build sheet info
+        sheet_info = {
+            "name": sheet_name,
+            "rows": total_rows,
+            "columns": headers,
+            "shape": (total_rows, len(headers)),
+            "sample_data": data_rows,
+            "data_types": {},
+            "null_counts": {},
+            "unique_counts": {},
+            "column_analysis": {}
+        }
         
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
+        # Analyze each column
+        for col_name in headers:
+            col_values = all_column_data[col_name]
+            non_null_values = [v for v in col_values if v is not None]
+            
+            # Determine data type
+            numeric_count = sum(1 for v in non_null_values if isinstance(v, (int, float)))
+            string_count = sum(1 for v in non_null_values if isinstance(v, str))
             
-            # Get headers from first row
-            headers = []
-            for cell in ws[1]:
-                headers.append(cell.value if cell.value else f"Column{cell.column}")
+            if numeric_count > string_count:
+                dtype = "numeric"
+            else:
+                dtype = "string"
             
-            # Collect data and analyze
-            data_rows = []
-            column_data = {header: [] for header in headers}
+            sheet_info["data_types"][col_name] = dtype
+            sheet_info["null_counts"][col_name] = len(col_values) - len(non_null_values)
+            sheet_info["unique_counts"][col_name] = len(set(non_null_values))
             
-            for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
-                if row_idx > 51:  # Limit to first 50 data rows for sample
-                    break
-                
-                row_data = {}
-                for col_idx, value in enumerate(row):
-                    if col_idx < len(headers):
-                        header = headers[col_idx]
-                        row_data[header] = value
-                        column_data[header].append(value)
-                
-                if any(v is not None for v in row):  # Skip completely empty rows
-                    data_rows.append(row_data)
-            
-            # Analyze all rows for statistics
-            all_column_data = {header: [] for header in headers}
-            total_rows = 0
-            
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                total_rows += 1
-                for col_idx, value in enumerate(row):
-                    if col_idx < len(headers):
-                        all_column_data[headers[col_idx]].append(value)
-            
-            # Build sheet info
-            sheet_info = {
-                "name": sheet_name,
-                "rows": total_rows,
-                "columns": headers,
-                "shape": (total_rows, len(headers)),
-                "sample_data": data_rows,
-                "data_types": {},
-                "null_counts": {},
-                "unique_counts": {},
-                "column_analysis": {}
+            col_analysis = {
+                "dtype": dtype,
+                "null_count": sheet_info["null_counts"][col_name],
+                "unique_count": sheet_info["unique_counts"][col_name],
+                "unique_ratio": sheet_info["unique_counts"][col_name] / len(col_values) if col_values else 0
             }
             
-            # Analyze each column
-            for col_name in headers:
-                col_values = all_column_data[col_name]
-                non_null_values = [v for v in col_values if v is not None]
-                
-                # Determine data type
-                numeric_count = sum(1 for v in non_null_values if isinstance(v, (int, float)))
-                string_count = sum(1 for v in non_null_values if isinstance(v, str))
-                
-                if numeric_count > string_count:
-                    dtype = "numeric"
-                else:
-                    dtype = "string"
-                
-                sheet_info["data_types"][col_name] = dtype
-                sheet_info["null_counts"][col_name] = len(col_values) - len(non_null_values)
-                sheet_info["unique_counts"][col_name] = len(set(non_null_values))
-                
-                col_analysis = {
-                    "dtype": dtype,
-                    "null_count": sheet_info["null_counts"][col_name],
-                    "unique_count": sheet_info["unique_counts"][col_name],
-                    "unique_ratio": sheet_info["unique_counts"][col_name] / len(col_values) if col_values else 0
-                }
-                
-                # For numeric columns, add statistics
-                if dtype == "numeric" and non_null_values:
-                    numeric_values = [v for v in non_null_values if isinstance(v, (int, float))]
-                    if numeric_values:
-                        col_analysis["min"] = float(min(numeric_values))
-                        col_analysis["max"] = float(max(numeric_values))
-                        col_analysis["mean"] = float(sum(numeric_values) / len(numeric_values))
-                        sorted_values = sorted(numeric_values)
-                        mid = len(sorted_values) // 2
-                        if len(sorted_values) % 2 == 0:
-                            col_analysis["median"] = float((sorted_values[mid-1] + sorted_values[mid]) / 2)
-                        else:
-                            col_analysis["median"] = float(sorted_values[mid])
-                
-                # For string columns, add sample unique values
-                if dtype == "string":
-                    string_values = [str(v) for v in non_null_values if v is not None]
-                    unique_values = list(set(string_values))[:20]
-                    col_analysis["sample_unique_values"] = unique_values
+            # For numeric columns, add statistics
+            if dtype == "numeric" and non_null_values:
+                numeric_values = [v for v in non_null_values if isinstance(v, (int, float))]
+                if numeric_values:
+                    col_analysis["min"] = float(min(numeric_values))
+                    col_analysis["max"] = float(max(numeric_values))
+                    col_analysis["mean"] = float(sum(numeric_values) / len(numeric_values))
+                    sorted_values = sorted(numeric_values)
+                    mid = len(sorted_values) // 2
+                    if len(sorted_values) % 2 == 0:
+                        col_analysis["median"] = float((sorted_values[mid-1] + sorted_values[mid]) / 2)
+                    else:
+                        col_analysis["median"] = float(sorted_values[mid])
+            
+            # For string columns, add sample unique values
+            if dtype == "string":
+                string_values = [str(v) for v in non_null_values if v is not None]
+                unique_values = list(set(string_values))[:20]
+                col_analysis["sample_unique_values"] = unique_values
+                
+                # Check if it looks like a product/box description
+                if any(keyword in col_name.lower() for keyword in ['box', 'product', 'name']):
+                    # Extract potential dimensions
+                    dimension_examples = []
                     
-                    # Check if it looks like a product/box description
-                    if any(keyword in col_name.lower() for keyword in ['box', 'product', 'name']):
-                        # Extract potential dimensions
-                        dimension_pattern = r'(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)'
-                        dimension_examples = []
-                        
-                        for val in string_values[:100]:  # Check first 100 values
-                            if re.search(dimension_pattern, val):
-                                dimension_examples.append(val)
-                                if len(dimension_examples) >= 10:
-                                    break
-                        
-                        if dimension_examples:
-                            col_analysis["contains_dimensions"] = True
-                            col_analysis["dimension_examples"] = dimension_examples
-                
-                sheet_info["column_analysis"][col_name] = col_analysis
+                    for val in string_values[:100]:  # Check first 100 values
+                        if DIMENSION_PATTERN.search(val):
+                            dimension_examples.append(val)
+                            if len(dimension_examples) >= 10:
+                                break
+                    
+                    if dimension_examples:
+                        col_analysis["contains_dimensions"] = True
+                        col_analysis["dimension_examples"] = dimension_examples
             
-            sheets_info.append(sheet_info)
-        
-        # Close workbook
-        wb.close()
-        
-        # Clean up temp file
-        os.unlink(temp_file.name)
-        
-        # Create analysis result
-        analysis_result = {
-            "filename": file.filename,
-            "analysis_date": datetime.now().isoformat(),
-            "sheets": sheets_info
-        }
-        
-        # Save to JSON file
-        output_filename = f"excel_digest_{file.filename.replace('.xlsx', '').replace('.xls', '')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        output_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), output_filename)
+            sheet_info["column_analysis"][col_name] = col_analysis
         
-        with open(output_path, 'w') as f:
-            json.dump(analysis_result, f, indent=2)
-        
-        return {
-            "message": f"Excel file digested successfully",
-            "digest_file": output_filename,
-            "summary": {
-                "filename": file.filename,
-                "sheets": len(sheets_info),
-                "total_rows": sum(sheet["rows"] for sheet in sheets_info),
-                "digest_saved_to": output_filename
-            }
+        sheets_info.append(sheet_info)
+    
+    # Close workbook
+    wb.close()
+    
+    # Create analysis result
+    analysis_result = {
+        "filename": filename,
+        "analysis_date": datetime.now().isoformat(),
+        "sheets": sheets_info
+    }
+    
+    # Save to JSON file
+    output_filename = f"excel_digest_{filename.replace('.xlsx', '').replace('.xls', '')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), output_filename)
+    
+    with open(output_path, 'w') as f:
+        json.dump(analysis_result, f, indent=2)
+    
+    return {
+        "message": f"Excel file digested successfully",
+        "digest_file": output_filename,
+        "summary": {
+            "filename": filename,
+            "sheets": len(sheets_info),
+            "total_rows": sum(sheet["rows"] for sheet in sheets_info),
+            "digest_saved_to": output_filename
         }
-        
+    }
+
+
+async def analyze_excel_structure(file: UploadFile) -> dict:
+    """Analyze Excel file structure for import preview"""
+    temp_path, _ = await _save_upload_to_temp(file)
+    try:
+        return await _run_in_excel_pool(_analyze_workbook_structure, temp_path, file.filename)
     except Exception as e:
-        # Clean up temp file on error
-        if os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
         raise HTTPException(status_code=500, detail=f"Error analyzing file: {str(e)}")
+    finally:
+        # Clean up temp file
+        os.unlink(temp_path)
 
 
 def get_dimensions_from_name(name: str) -> Optional[tuple]:
     """Extract dimensions from a box name like '10x10x10 Box' or '17.5x15.125x3.25'"""
-    match = re.search(r'(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)', name)
+    match = DIMENSION_PATTERN.search(name)
     if match:
         return (float(match.group(1)), float(match.group(2)), float(match.group(3)))
     return None
@@ -445,8 +539,7 @@ def categorize_product(product_name: str) -> str:
     # Check if it's a box - more flexible now
     elif not any(x in name_lower for x in ['pack material', 'pack mat', 'pack service', 'pack svc']):
         # If it has dimensions anywhere in the name (e.g., "10x10x48" or "Golf club 10x10x48"), consider it a box
-        import re
-        if re.search(r'\d+(?:\.\d+)?\s*[xX]\s*\d+(?:\.\d+)?\s*[xX]\s*\d+(?:\.\d+)?', product_name):
+        if DIMENSION_PATTERN.search(product_name):
             return 'box'
         elif 'box' in name_lower:
             return 'box'
@@ -454,252 +547,255 @@ def categorize_product(product_name: str) -> str:
     return 'other'
 
 
-async def analyze_import_for_matching(
-    store_id: str,
-    file: UploadFile,
-    store_data: dict
-) -> dict:
-    """Analyze Excel file for three-tier matching with store boxes"""
+def _read_price_sheet(path: str) -> dict:
+    """
+    Parse a price sheet and group its items by dimensions (runs in the Excel worker pool)
     
-    # Validate file type
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
+    Returns:
+        dict with 'rows' (all rows as dicts), and 'groups'/'groups_exact'
+        (items keyed by integer and exact dimension strings)
+    """
+    # Read Excel file with minimal memory usage
+    wb = load_workbook(path, read_only=True, keep_vba=False, data_only=True)
+    ws = wb.active
     
-    # Check file size (512KB limit for production)
-    MAX_FILE_SIZE = 512 * 1024  # 512KB
+    # Get headers from first row
+    headers = {}
+    for col_idx, cell in enumerate(ws[1], 1):
+        if cell.value:
+            headers[cell.value] = col_idx
     
-    # Stream file to temp location to avoid loading into memory
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
-    try:
-        # Stream file content to temp file in chunks
-        total_size = 0
-        chunk_size = 8192  # 8KB chunks
-        
-        while True:
-            chunk = await file.read(chunk_size)
-            if not chunk:
-                break
-            total_size += len(chunk)
-            if total_size > MAX_FILE_SIZE:
-                temp_file.close()
-                os.unlink(temp_file.name)
-                raise HTTPException(status_code=400, detail="File size exceeds 512KB limit")
-            temp_file.write(chunk)
-        
-        temp_file.close()
-        await file.seek(0)  # Reset file pointer
-        
-        # Read Excel file with minimal memory usage
-        wb = load_workbook(temp_file.name, read_only=True, keep_vba=False, data_only=True)
-        ws = wb.active
-        
-        # Get headers from first row
-        headers = {}
-        for col_idx, cell in enumerate(ws[1], 1):
-            if cell.value:
-                headers[cell.value] = col_idx
-        
-        
-        # Read all rows into memory for processing
-        rows_data = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if row[0] is not None:  # Skip empty rows
-                row_dict = {}
-                for header, col_idx in headers.items():
-                    if col_idx <= len(row):
-                        row_dict[header] = row[col_idx - 1]
-                rows_data.append(row_dict)
-        
-        
-        # Group Excel items by dimensions
-        excel_dimension_groups = {}
-        excel_dimension_groups_exact = {}  # Keep exact dimensions
-        
-        
-        for row_idx, row in enumerate(rows_data):
-            product_name = str(row.get('Product name', ''))
-            
-            # Extract dimensions using regex (handles decimal dimensions and mixed case X)
-            match = re.search(r'(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)', product_name)
-            if match:
-                # Keep both exact and integer versions
-                dims_exact = [match.group(i) for i in range(1, 4)]
-                dims_int = [int(float(match.group(i))) for i in range(1, 4)]
-                dim_str_exact = f"{dims_exact[0]}x{dims_exact[1]}x{dims_exact[2]}"
-                dim_str_int = f"{dims_int[0]}x{dims_int[1]}x{dims_int[2]}"
-                
-                
-                if dim_str_int not in excel_dimension_groups:
-                    excel_dimension_groups[dim_str_int] = []
-                if dim_str_exact not in excel_dimension_groups_exact:
-                    excel_dimension_groups_exact[dim_str_exact] = []
-                
-                # Categorize the product
-                category = categorize_product(product_name)
-                
-                # Extract suffix (everything after the dimensions)
-                suffix = product_name[match.end():].strip()
-                
-                item_data = {
-                    'item_id': row.get('Item'),
-                    'product_name': product_name,
-                    'price': float(row.get('Price', 0) or 0),
-                    'category': category,
-                    'dimensions_exact': dim_str_exact,
-                    'dimensions_int': dim_str_int,
-                    'suffix': suffix  # Store suffix for display in probable matches
-                }
-                
-                excel_dimension_groups[dim_str_int].append(item_data)
-                excel_dimension_groups_exact[dim_str_exact].append(item_data)
-            else:
-                # TODO: Handle special items like "Electronics Insert", "Med Electronics Insert"
-                # These may need special categorization or matching logic
-                # Discuss with store managers about how to handle inserts vs regular items
-                pass
-        
-        
-        # Analyze matches
-        perfect_matches = []
-        probable_matches = []
-        manual_required = []
-        incomplete_matches = []
-        
-        
-        for box_idx, box in enumerate(store_data['boxes']):
-            box_model = box.get('model', '')
-            # Keep original dimensions (may include decimals)
-            box_dims_original = box['dimensions']
-            box_dims_int = [int(float(d)) for d in box['dimensions']]
-            box_dim_str = f"{box_dims_original[0]}x{box_dims_original[1]}x{box_dims_original[2]}"
-            box_dim_str_int = f"{box_dims_int[0]}x{box_dims_int[1]}x{box_dims_int[2]}"
+    
+    # Read all rows into memory for processing
+    rows_data = []
+    for row in ws.iter_rows(min_row=2, values_only=True):
+        if row[0] is not None:  # Skip empty rows
+            row_dict = {}
+            for header, col_idx in headers.items():
+                if col_idx <= len(row):
+                    row_dict[header] = row[col_idx - 1]
+            rows_data.append(row_dict)
+    
+    
+    # Group Excel items by dimensions
+    excel_dimension_groups = {}
+    excel_dimension_groups_exact = {}  # Keep exact dimensions
+    
+    
+    for row_idx, row in enumerate(rows_data):
+        product_name = str(row.get('Product name', ''))
+        
+        # Extract dimensions using regex (handles decimal dimensions and mixed case X)
+        match = DIMENSION_PATTERN.search(product_name)
+        if match:
+            # Keep both exact and integer versions
+            dims_exact = [match.group(i) for i in range(1, 4)]
+            dims_int = [int(float(match.group(i))) for i in range(1, 4)]
+            dim_str_exact = f"{dims_exact[0]}x{dims_exact[1]}x{dims_exact[2]}"
+            dim_str_int = f"{dims_int[0]}x{dims_int[1]}x{dims_int[2]}"
             
             
-            # Check for perfect match using MPOS_mapping
-            if 'MPOS_mapping' in box and box['MPOS_mapping']:
-                mapping = box['MPOS_mapping']
-                
-                # Verify all mapped items exist in Excel
-                all_found = True
-                mapped_items = {}
-                missing_items = []
-                
-                for field, item_id in mapping.items():
-                    found = False
-                    # Convert item_id to string for comparison
-                    item_id_str = str(item_id)
-                    for row in rows_data:
-                        # Also convert Excel item to string for comparison
-                        if str(row.get('Item', '')) == item_id_str:
-                            mapped_items[field] = {
-                                'item_id': item_id,
-                                'product_name': row.get('Product name'),
-                                'price': float(row.get('Price', 0) or 0)
-                            }
-                            found = True
-                            break
-                    if not found:
-                        all_found = False
-                        missing_items.append(f"{field}: {item_id}")
-                
-                
-                if all_found and len(mapped_items) >= 9:  # All 9 required fields including basic_materials and basic_service
-                    perfect_matches.append({
-                        'box': {
-                            'model': box_model,
-                            'dimensions': box_dim_str,
-                            'dimensions_int': box_dim_str_int
-                        },
-                        'mapped_items': mapped_items,
-                        'current_prices': box.get('itemized-prices', {})
-                    })
-                    continue
-            
-            # Check for dimension-based match (use integer dimensions for matching)
-            if box_dim_str_int in excel_dimension_groups:
-                excel_items = excel_dimension_groups[box_dim_str_int]
-                
-                
-                # Analyze completeness for itemized pricing
-                categories_found = {}
-                for item in excel_items:
-                    if item['category'] != 'other':
-                        categories_found[item['category']] = item
-                
-                required_categories = ['box', 'basic_materials', 'basic_service',
-                                     'standard_materials', 'standard_service',
-                                     'fragile_materials', 'fragile_service',
-                                     'custom_materials', 'custom_service']
-                
-                missing = [cat for cat in required_categories if cat not in categories_found]
-                
-                
-                if len(missing) == 0:
-                    probable_matches.append({
-                        'box': {
-                            'model': box_model,
-                            'dimensions': box_dim_str,
-                            'dimensions_int': box_dim_str_int
-                        },
-                        'excel_items': excel_items,
-                        'categories_found': categories_found,
-                        'is_complete': True
-                    })
+            if dim_str_int not in excel_dimension_groups:
+                excel_dimension_groups[dim_str_int] = []
+            if dim_str_exact not in excel_dimension_groups_exact:
+                excel_dimension_groups_exact[dim_str_exact] = []
+            
+            # Categorize the product
+            category = categorize_product(product_name)
+            
+            # Extract suffix (everything after the dimensions)
+            suffix = product_name[match.end():].strip()
+            
+            item_data = {
+                'item_id': row.get('Item'),
+                'product_name': product_name,
+                'price': float(row.get('Price', 0) or 0),
+                'category': category,
+                'dimensions_exact': dim_str_exact,
+                'dimensions_int': dim_str_int,
+                'suffix': suffix  # Store suffix for display in probable matches
+            }
+            
+            excel_dimension_groups[dim_str_int].append(item_data)
+            excel_dimension_groups_exact[dim_str_exact].append(item_data)
+        else:
+            # TODO: Handle special items like "Electronics Insert", "Med Electronics Insert"
+            # These may need special categorization or matching logic
+            # Discuss with store managers about how to handle inserts vs regular items
+            pass
+    
+    # Close workbook
+    wb.close()
+    
+    return {
+        'rows': rows_data,
+        'groups': excel_dimension_groups,
+        'groups_exact': excel_dimension_groups_exact
+    }
+
+
+def _match_store_boxes(store_id: str, store_data: dict, sheet: dict) -> dict:
+    """Three-tier matching of a parsed price sheet against store boxes"""
+    excel_dimension_groups = sheet['groups']
+    excel_dimension_groups_exact = sheet['groups_exact']
+    
+    # Index rows by item number (first occurrence wins) for MPOS_mapping lookups
+    rows_by_item = {}
+    for row in sheet['rows']:
+        rows_by_item.setdefault(str(row.get('Item', '')), row)
+    
+    # Analyze matches
+    perfect_matches = []
+    probable_matches = []
+    manual_required = []
+    incomplete_matches = []
+    
+    
+    for box_idx, box in enumerate(store_data['boxes']):
+        box_model = box.get('model', '')
+        # Keep original dimensions (may include decimals)
+        box_dims_original = box['dimensions']
+        box_dims_int = [int(float(d)) for d in box['dimensions']]
+        box_dim_str = f"{box_dims_original[0]}x{box_dims_original[1]}x{box_dims_original[2]}"
+        box_dim_str_int = f"{box_dims_int[0]}x{box_dims_int[1]}x{box_dims_int[2]}"
+        
+        
+        # Check for perfect match using MPOS_mapping
+        if 'MPOS_mapping' in box and box['MPOS_mapping']:
+            mapping = box['MPOS_mapping']
+            
+            # Verify all mapped items exist in Excel
+            all_found = True
+            mapped_items = {}
+            missing_items = []
+            
+            for field, item_id in mapping.items():
+                # Item numbers are compared as strings
+                row = rows_by_item.get(str(item_id))
+                if row is not None:
+                    mapped_items[field] = {
+                        'item_id': item_id,
+                        'product_name': row.get('Product name'),
+                        'price': float(row.get('Price', 0) or 0)
+                    }
                 else:
-                    # Incomplete category set - goes to incomplete section
-                    incomplete_matches.append({
-                        'box': {
-                            'model': box_model,
-                            'dimensions': box_dim_str,
-                            'dimensions_int': box_dim_str_int
-                        },
-                        'excel_items': excel_items,
-                        'categories_found': categories_found,
-                        'missing_categories': missing,
-                        'reason': 'incomplete_categories'
-                    })
-            else:
-                # No dimension match found
-                manual_required.append({
+                    all_found = False
+                    missing_items.append(f"{field}: {item_id}")
+            
+            
+            if all_found and len(mapped_items) >= 9:  # All 9 required fields including basic_materials and basic_service
+                perfect_matches.append({
                     'box': {
                         'model': box_model,
                         'dimensions': box_dim_str,
                         'dimensions_int': box_dim_str_int
                     },
-                    'excel_items': [],
-                    'reason': 'no_dimension_match'
+                    'mapped_items': mapped_items,
+                    'current_prices': box.get('itemized-prices', {})
                 })
+                continue
         
-        # Close workbook
-        wb.close()
-        
-        # Clean up temp file
-        os.unlink(temp_file.name)
-        
-        
-        # Return analysis results
-        return {
-            'store_id': store_id,
-            'summary': {
-                'total_boxes': len(store_data['boxes']),
-                'perfect_matches': len(perfect_matches),
-                'probable_matches': len(probable_matches),
-                'incomplete_matches': len(incomplete_matches),
-                'manual_required': len(manual_required),
-                'excel_dimensions': len(excel_dimension_groups)
-            },
-            'perfect_matches': perfect_matches,
-            'probable_matches': probable_matches,
-            'incomplete_matches': incomplete_matches,
-            'manual_required': manual_required,
-            'excel_dimension_groups': excel_dimension_groups,
-            'excel_dimension_groups_exact': excel_dimension_groups_exact
-        }
-        
+        # Check for dimension-based match (use integer dimensions for matching)
+        if box_dim_str_int in excel_dimension_groups:
+            excel_items = excel_dimension_groups[box_dim_str_int]
+            
+            
+            # Analyze completeness for itemized pricing
+            categories_found = {}
+            for item in excel_items:
+                if item['category'] != 'other':
+                    categories_found[item['category']] = item
+            
+            required_categories = ['box', 'basic_materials', 'basic_service',
+                                 'standard_materials', 'standard_service',
+                                 'fragile_materials', 'fragile_service',
+                                 'custom_materials', 'custom_service']
+            
+            missing = [cat for cat in required_categories if cat not in categories_found]
+            
+            
+            if len(missing) == 0:
+                probable_matches.append({
+                    'box': {
+                        'model': box_model,
+                        'dimensions': box_dim_str,
+                        'dimensions_int': box_dim_str_int
+                    },
+                    'excel_items': excel_items,
+                    'categories_found': categories_found,
+                    'is_complete': True
+                })
+            else:
+                # Incomplete category set - goes to incomplete section
+                incomplete_matches.append({
+                    'box': {
+                        'model': box_model,
+                        'dimensions': box_dim_str,
+                        'dimensions_int': box_dim_str_int
+                    },
+                    'excel_items': excel_items,
+                    'categories_found': categories_found,
+                    'missing_categories': missing,
+                    'reason': 'incomplete_categories'
+                })
+        else:
+            # No dimension match found
+            manual_required.append({
+                'box': {
+                    'model': box_model,
+                    'dimensions': box_dim_str,
+                    'dimensions_int': box_dim_str_int
+                },
+                'excel_items': [],
+                'reason': 'no_dimension_match'
+            })
+    
+    
+    # Return analysis results
+    return {
+        'store_id': store_id,
+        'summary': {
+            'total_boxes': len(store_data['boxes']),
+            'perfect_matches': len(perfect_matches),
+            'probable_matches': len(probable_matches),
+            'incomplete_matches': len(incomplete_matches),
+            'manual_required': len(manual_required),
+            'excel_dimensions': len(excel_dimension_groups)
+        },
+        'perfect_matches': perfect_matches,
+        'probable_matches': probable_matches,
+        'incomplete_matches': incomplete_matches,
+        'manual_required': manual_required,
+        'excel_dimension_groups': excel_dimension_groups,
+        'excel_dimension_groups_exact': excel_dimension_groups_exact
+    }
+
+
+async def analyze_import_for_matching(
+    store_id: str,
+    file: UploadFile,
+    store_data: dict
+) -> dict:
+    """
+    Analyze Excel file for three-tier matching with store boxes
+    
+    The parsed sheet is cached under the file's hash (returned as
+    analysis_id), so re-uploading the same sheet only re-runs the matching.
+    """
+    temp_path, analysis_id = await _save_upload_to_temp(file)
+    try:
+        sheet = get_cached_price_sheet(store_id, analysis_id)
+        if sheet is None:
+            sheet = await _run_in_excel_pool(_read_price_sheet, temp_path)
+            _cache_price_sheet(store_id, analysis_id, sheet)
+        
+        result = _match_store_boxes(store_id, store_data, sheet)
+        result['analysis_id'] = analysis_id
+        return result
     except Exception as e:
-        if os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
         raise HTTPException(status_code=500, detail=f"Error analyzing import: {str(e)}")
+    finally:
+        os.unlink(temp_path)
 
 
 def apply_import_updates(
@@ -775,6 +871,72 @@ def apply_import_updates(
     }
 
 
+def _collect_box_dimensions(path: str) -> dict:
+    """
+    Group the boxes in a price sheet by dimensions (runs in the Excel worker pool)
+    
+    Returns:
+        dict of dimensions_str -> {dimensions, count, models, prices}
+    """
+    # Read Excel file with minimal memory usage
+    wb = load_workbook(path, read_only=True, keep_vba=False, data_only=True)
+    ws = wb.active
+    
+    # Get headers
+    headers = {}
+    for col_idx, cell in enumerate(ws[1], 1):
+        if cell.value:
+            headers[cell.value] = col_idx
+    
+    name_col = headers.get('Product name')
+    price_col = headers.get('Price')
+    
+    # Stream rows and group by dimensions in a single pass, so library
+    # lookups happen once per unique size rather than once per row
+    discovered_boxes = {}  # dimensions_str -> {count, models, prices}
+    
+    for row in ws.iter_rows(min_row=2, values_only=True):
+        if row[0] is None:  # Skip empty rows
+            continue
+        
+        product_name = str(row[name_col - 1]) if name_col and name_col <= len(row) else ''
+        
+        match = DIMENSION_PATTERN.search(product_name)
+        if not match:
+            continue
+        
+        # Only process boxes (not services or materials)
+        if categorize_product(product_name) != 'box':
+            continue
+        
+        # Convert to floats and sort largest to smallest
+        dims = [float(match.group(i)) for i in range(1, 4)]
+        dims.sort(reverse=True)
+        dims_str = "x".join([str(int(d)) if d.is_integer() else str(d) for d in dims])
+        
+        # Extract price
+        price = row[price_col - 1] if price_col and price_col <= len(row) else 0
+        price = float(price or 0)
+        
+        # Store discovery info
+        if dims_str not in discovered_boxes:
+            discovered_boxes[dims_str] = {
+                'dimensions': dims,
+                'count': 0,
+                'models': [],
+                'prices': []
+            }
+        
+        discovered_boxes[dims_str]['count'] += 1
+        discovered_boxes[dims_str]['models'].append(product_name)
+        if price > 0:
+            discovered_boxes[dims_str]['prices'].append(price)
+    
+    wb.close()
+    
+    return discovered_boxes
+
+
 async def discover_boxes_from_prices(file: UploadFile, store_data: dict) -> dict:
     """
     Analyze price sheet to discover box dimensions and suggest matches from library
@@ -786,156 +948,73 @@ async def discover_boxes_from_prices(file: UploadFile, store_data: dict) -> dict
         - unmatched_dimensions: Dimensions with no library match
         - already_in_store: Dimensions already in the store
     """
-    # Validate file type
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
+    temp_path, _ = await _save_upload_to_temp(file)
+    try:
+        discovered_boxes = await _run_in_excel_pool(_collect_box_dimensions, temp_path)
+    finally:
+        # Clean up temp file
+        os.unlink(temp_path)
     
-    # Check file size (512KB limit for production)
-    MAX_FILE_SIZE = 512 * 1024  # 512KB
+    # Now match against box library
+    library = get_box_library()
     
-    # Stream file to temp location to avoid loading into memory
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
-    try:
-        # Stream file content to temp file in chunks
-        total_size = 0
-        chunk_size = 8192  # 8KB chunks
-        
-        while True:
-            chunk = await file.read(chunk_size)
-            if not chunk:
-                break
-            total_size += len(chunk)
-            if total_size > MAX_FILE_SIZE:
-                temp_file.close()
-                os.unlink(temp_file.name)
-                raise HTTPException(status_code=400, detail="File size exceeds 512KB limit")
-            temp_file.write(chunk)
-        
-        temp_file.close()
-        await file.seek(0)  # Reset file pointer
-        
-        # Read Excel file with minimal memory usage
-        wb = load_workbook(temp_file.name, read_only=True, keep_vba=False, data_only=True)
-        ws = wb.active
-        
-        # Get headers
-        headers = {}
-        for col_idx, cell in enumerate(ws[1], 1):
-            if cell.value:
-                headers[cell.value] = col_idx
-        
-        # Read all rows into memory (reusing pattern from analyze_import_for_matching)
-        rows_data = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if row[0] is not None:  # Skip empty rows
-                row_dict = {}
-                for header, col_idx in headers.items():
-                    if col_idx <= len(row):
-                        row_dict[header] = row[col_idx - 1]
-                rows_data.append(row_dict)
-        
-        wb.close()
-        
-        # Group by dimensions (reusing logic from analyze_import_for_matching)
-        discovered_boxes = {}  # dimensions_str -> {count, models, prices}
-        
-        for row in rows_data:
-            product_name = str(row.get('Product name', ''))
-            
-            # Extract dimensions using same regex as analyze_import_for_matching
-            match = re.search(r'(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)\s*[xX]\s*(\d+(?:\.\d+)?)', product_name)
-            if match:
-                # Convert to floats and sort largest to smallest
-                dims = [float(match.group(i)) for i in range(1, 4)]
-                dims.sort(reverse=True)
-                dims_str = "x".join([str(int(d)) if d.is_integer() else str(d) for d in dims])
-                
-                # Categorize the product
-                category = categorize_product(product_name)
-                
-                # Only process boxes (not services or materials)
-                if category == 'box':
-                    # Extract price
-                    price = float(row.get('Price', 0) or 0)
-                    
-                    # Store discovery info
-                    if dims_str not in discovered_boxes:
-                        discovered_boxes[dims_str] = {
-                            'dimensions': dims,
-                            'count': 0,
-                            'models': [],
-                            'prices': []
-                        }
-                    
-                    discovered_boxes[dims_str]['count'] += 1
-                    discovered_boxes[dims_str]['models'].append(product_name)
-                    if price > 0:
-                        discovered_boxes[dims_str]['prices'].append(price)
-        
-        # Now match against box library
-        library = BoxLibrary()
-        
-        # Get existing box dimensions to avoid duplicates
-        existing_dimensions = set()
-        for box in store_data.get('boxes', []):
-            dims = sorted(box['dimensions'], reverse=True)
-            dims_str = "x".join([str(d) for d in dims])
-            existing_dimensions.add(dims_str)
-        
-        results = {
-            'discovered_dimensions': [],
-            'library_matches': [],
-            'unmatched_dimensions': [],
-            'already_in_store': []
-        }
+    # Get existing box dimensions to avoid duplicates
+    existing_dimensions = set()
+    for box in store_data.get('boxes', []):
+        dims = sorted(box['dimensions'], reverse=True)
+        dims_str = "x".join([str(d) for d in dims])
+        existing_dimensions.add(dims_str)
+    
+    results = {
+        'discovered_dimensions': [],
+        'library_matches': [],
+        'unmatched_dimensions': [],
+        'already_in_store': []
+    }
+    
+    # Process each discovered dimension
+    for dims_str, info in discovered_boxes.items():
+        dims = info['dimensions']
         
-        # Process each discovered dimension
-        for dims_str, info in discovered_boxes.items():
-            dims = info['dimensions']
-            
-            # Check if already in store
-            if dims_str in existing_dimensions:
-                results['already_in_store'].append({
-                    'dimensions': dims,
-                    'dimensions_str': dims_str,
-                    'count': info['count'],
-                    'models': info['models'],
-                    'avg_price': sum(info['prices']) / len(info['prices']) if info['prices'] else None
-                })
-                continue
-            
-            # Record as discovered
-            discovered = {
+        # Check if already in store
+        if dims_str in existing_dimensions:
+            results['already_in_store'].append({
                 'dimensions': dims,
                 'dimensions_str': dims_str,
                 'count': info['count'],
                 'models': info['models'],
                 'avg_price': sum(info['prices']) / len(info['prices']) if info['prices'] else None
-            }
-            results['discovered_dimensions'].append(discovered)
-            
-            # Look for ALL boxes with these exact dimensions (may have different alternate depths)
-            exact_matches = library.find_all_by_dimensions(dims)
-            if exact_matches:
-                results['library_matches'].append({
-                    'discovered': discovered,
-                    'library_boxes': exact_matches  # Multiple boxes with same dims but different alternate depths
-                })
-            else:
-                # No match - needs custom box
-                results['unmatched_dimensions'].append(discovered)
-        
-        # Summary statistics
-        results['summary'] = {
-            'total_boxes_found': len(discovered_boxes),
-            'already_in_store': len(results['already_in_store']),
-            'new_dimensions': len(results['discovered_dimensions']),
-            'exact_matches': len(results['library_matches']),
-            'unmatched': len(results['unmatched_dimensions'])
+            })
+            continue
+        
+        # Record as discovered
+        discovered = {
+            'dimensions': dims,
+            'dimensions_str': dims_str,
+            'count': info['count'],
+            'models': info['models'],
+            'avg_price': sum(info['prices']) / len(info['prices']) if info['prices'] else None
         }
-        
-        return results
-        
-    finally:
-        # Clean up temp file
-        os.unlink(temp_file.name)
\ No newline at end of file
+        results['discovered_dimensions'].append(discovered)
+        
+        # Look for ALL boxes with these exact dimensions (may have different alternate depths)
+        exact_matches = library.find_all_by_dimensions(dims)
+        if exact_matches:
+            results['library_matches'].append({
+                'discovered': discovered,
+                'library_boxes': exact_matches  # Multiple boxes with same dims but different alternate depths
+            })
+        else:
+            # No match - needs custom box
+            results['unmatched_dimensions'].append(discovered)
+    
+    # Summary statistics
+    results['summary'] = {
+        'total_boxes_found': len(discovered_boxes),
+        'already_in_store': len(results['already_in_store']),
+        'new_dimensions': len(results['discovered_dimensions']),
+        'exact_matches': len(results['library_matches']),
+        'unmatched': len(results['unmatched_dimensions'])
+    }
+    
+    return results
@@ -0,0 +1,55 @@
+"""
+Conditional GET helpers - ETag generation and 304 responses for JSON endpoints
+"""
+
+import hashlib
+
+import orjson
+from fastapi import Request, Response
+
+# Responses are per-store and behind auth: browsers may keep them but must
+# revalidate with If-None-Match before reuse
+CACHE_CONTROL = "private, must-revalidate"
+
+
+def encode_json(data) -> bytes:
+    """Encode data as compact JSON bytes, the same way ORJSONResponse does"""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def make_etag(payload: bytes) -> str:
+    """Strong ETag (quoted) for a serialized payload"""
+    return '"' + hashlib.blake2b(payload, digest_size=8).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the client's If-None-Match header covers the given ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+def cached_json_response(request: Request, payload: bytes, etag: str) -> Response:
+    """Serve pre-serialized JSON, answering 304 when the client copy is current"""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+def json_response_with_etag(request: Request, data) -> Response:
+    """
+    Serialize data and serve it with a content-hash ETag
+    
+    The handler still builds the data, but unchanged responses go back as an
+    empty 304 instead of the full body.
+    """
+    payload = encode_json(data)
+    return cached_json_response(request, payload, make_etag(payload))
@@ -4,8 +4,11 @@ Default packing rules and recommendation engine config loaded from packing_guide
 
 import logging
 import os
-import yaml
 import sys
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+from backend.lib.yaml_helpers import load_yaml
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -15,7 +18,7 @@ _guidelines_path = os.path.join(os.path.dirname(__file__), '..', '..', 'stores',
 
 try:
     with open(_guidelines_path, 'r') as f:
-        _guidelines_data = yaml.safe_load(f)
+        _guidelines_data = load_yaml(f)
 except Exception as e:
     logger.critical(f"Could not load required packing_guidelines.yml: {e}")
     sys.exit(1)
@@ -52,7 +55,26 @@ for packing_type in ['basic', 'standard', 'fragile', 'custom']:
     # Capitalize the packing type for consistency with existing code
     DEFAULT_RULES[packing_type.capitalize()] = rule
 
-def get_default_rule(packing_type: str) -> dict:
+# Defaults are shared by every request; freeze them so they can be handed
+# out without defensive copies
+DEFAULT_RULES = MappingProxyType({
+    packing_type: MappingProxyType(rule) for packing_type, rule in DEFAULT_RULES.items()
+})
+DEFAULT_ENGINE_CONFIG = MappingProxyType(DEFAULT_ENGINE_CONFIG)
+
+# API-shaped default rules, built once (plain dicts so they serialize directly)
+_ALL_DEFAULT_RULES = tuple(
+    {
+        'packing_type': packing_type,
+        'padding_inches': rule_data['padding_inches'],
+        'wizard_description': rule_data['wizard_description'],
+        'label_instructions': rule_data['label_instructions'],
+        'is_custom': False
+    }
+    for packing_type, rule_data in DEFAULT_RULES.items()
+)
+
+def get_default_rule(packing_type: str) -> Mapping:
     """
     Get the default rule for a given packing type
     
@@ -60,31 +82,22 @@ def get_default_rule(packing_type: str) -> dict:
         packing_type: One of 'Basic', 'Standard', 'Fragile', 'Custom'
         
     Returns:
-        Dict with padding_inches, wizard_description, label_instructions
+        Read-only mapping with padding_inches, wizard_description, label_instructions
     """
     if packing_type not in DEFAULT_RULES:
         raise ValueError(f"Unknown packing type: {packing_type}")
-    return DEFAULT_RULES[packing_type].copy()
+    return DEFAULT_RULES[packing_type]
 
-def get_all_default_rules():
-    """Get all default rules in a format suitable for API responses"""
-    rules = []
-    for packing_type, rule_data in DEFAULT_RULES.items():
-        rules.append({
-            'packing_type': packing_type,
-            'padding_inches': rule_data['padding_inches'],
-            'wizard_description': rule_data['wizard_description'],
-            'label_instructions': rule_data['label_instructions'],
-            'is_custom': False
-        })
-    return rules
+def get_all_default_rules() -> Tuple[dict, ...]:
+    """Get all default rules in a format suitable for API responses (do not modify)"""
+    return _ALL_DEFAULT_RULES
 
-def get_default_engine_config():
-    """Get the default recommendation engine configuration"""
-    return DEFAULT_ENGINE_CONFIG.copy()
+def get_default_engine_config() -> Mapping:
+    """Get the default recommendation engine configuration (read-only)"""
+    return DEFAULT_ENGINE_CONFIG
 
 def get_default_engine_config_value(key, subkey=None):
     """Get a specific value from the default engine config"""
     if subkey:
         return DEFAULT_ENGINE_CONFIG.get(key, {}).get(subkey)
-    return DEFAULT_ENGINE_CONFIG.get(key)
\ No newline at end of file
+    return DEFAULT_ENGINE_CONFIG.get(key)
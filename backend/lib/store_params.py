@@ -0,0 +1,29 @@
+"""
+Shared path parameters for store-scoped endpoints
+"""
+
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Path
+
+# Store numbers are at most 6 digits (demo stores use the full width)
+MAX_STORE_ID_LENGTH = 6
+
+
+def _validated_store_id(store_id: str = Path(..., description="Store number (1-6 digits)")) -> str:
+    """
+    Validate the store_id path parameter
+    
+    Store IDs stay strings: sessions, the database and store YAML files all key
+    on the original text, so converting to int would lose leading zeros.
+    
+    Raises:
+        HTTPException: If store_id is not 1-6 ASCII digits
+    """
+    if not (0 < len(store_id) <= MAX_STORE_ID_LENGTH and store_id.isascii() and store_id.isdigit()):
+        raise HTTPException(status_code=422, detail="Invalid store ID")
+    return store_id
+
+
+# Validated store_id path parameter, e.g. `store_id: StoreId`
+StoreId = Annotated[str, Depends(_validated_store_id)]
@@ -3,16 +3,89 @@ YAML helper functions for loading and saving store configuration files.
 Handles the custom YAML format for box data with validation.
 """
 
+import copy
+import hashlib
 import logging
 import os
+import re
 import sys
+import threading
+import time
+import orjson
 import yaml
-from typing import Optional, Union
+from array import array
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Tuple, Union
 from fastapi import HTTPException
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Use the libyaml C loader when PyYAML was built with it (much faster parsing)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(stream):
+    """
+    Parse a YAML document (str, bytes or file) with the fastest safe loader
+    
+    Use this instead of yaml.safe_load, which always runs the pure-Python
+    parser even when libyaml is available.
+    """
+    return yaml.load(stream, Loader=_YamlLoader)
+
+# Store file path -> (mtime_ns, size, digest) of the contents last read or
+# written, so save_store_yaml can skip rewriting an unchanged file
+_file_digests: Dict[str, Tuple[int, int, bytes]] = {}
+
+
+def _digest(payload: bytes) -> bytes:
+    """Fingerprint store file contents"""
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+# Directory listing of stores/ used by store_exists(), refreshed at most
+# every STORE_LIST_TTL seconds (stores are created far less often than
+# login attempts hit the existence check)
+_STORE_LIST_TTL = float(os.environ.get('STORE_LIST_TTL', '5'))
+_store_files: FrozenSet[str] = frozenset()
+_store_files_time = float("-inf")
+_store_files_lock = threading.Lock()
+
+
+def store_exists(store_id: str) -> bool:
+    """
+    Check whether stores/store{store_id}.yml exists
+    
+    Answers from a cached scan of the stores directory, so a burst of
+    requests shares one scandir() instead of issuing a stat() each. A store
+    created by another process becomes visible within STORE_LIST_TTL seconds.
+    """
+    global _store_files, _store_files_time
+    
+    with _store_files_lock:
+        now = time.monotonic()
+        if now - _store_files_time > _STORE_LIST_TTL:
+            try:
+                with os.scandir("stores") as entries:
+                    _store_files = frozenset(
+                        entry.name for entry in entries
+                        if entry.name.startswith("store") and entry.name.endswith(".yml")
+                    )
+            except FileNotFoundError:
+                _store_files = frozenset()
+            _store_files_time = now
+        files = _store_files
+    
+    return f"store{store_id}.yml" in files
+
+
+def _invalidate_store_list() -> None:
+    """Force the next store_exists() call to rescan the stores directory"""
+    global _store_files_time
+    with _store_files_lock:
+        _store_files_time = float("-inf")
+
 
 def normalize_float(value: Union[int, float]) -> Union[int, float]:
     """Remove unnecessary .0 from floats for cleaner YAML output"""
@@ -21,22 +94,28 @@ def normalize_float(value: Union[int, float]) -> Union[int, float]:
     return value
 
 
-def load_store_yaml(store_id: str) -> dict:
-    """Load and validate store YAML configuration"""
-    # Demo store uses the same naming pattern as regular stores
-    yaml_file = f"stores/store{store_id}.yml"
+def _quoted(value) -> str:
+    """
+    Render a value as a double-quoted YAML scalar
 
-    if not os.path.exists(yaml_file):
-        error_msg = f"Store configuration file not found at {yaml_file}"
-        logger.error(error_msg)
-        raise HTTPException(status_code=404, detail=error_msg)
+    JSON string syntax is valid YAML double-quoted syntax, so orjson does the
+    escaping (quotes, backslashes, newlines) in C.
+    """
+    return orjson.dumps(str(value)).decode()
 
-    with open(yaml_file, "r") as f:
-        try:
-            store_data = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            logger.error(f"YAML parsing error: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"YAML parsing error: {str(e)}")
+
+@lru_cache(maxsize=64)
+def _load_store_yaml_cached(yaml_file: str, mtime_ns: int, size: int) -> dict:
+    """Parse and validate a store file; the file's mtime and size are part of the cache key"""
+    with open(yaml_file, "rb") as f:
+        raw = f.read()
+    _file_digests[yaml_file] = (mtime_ns, size, _digest(raw))
+
+    try:
+        store_data = yaml.load(raw, Loader=_YamlLoader)
+    except yaml.YAMLError as e:
+        logger.error(f"YAML parsing error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"YAML parsing error: {str(e)}")
 
     # Handle empty YAML files or files with just metadata
     if not store_data:
@@ -50,124 +129,229 @@ def load_store_yaml(store_id: str) -> dict:
         logger.error(error_msg)
         raise HTTPException(status_code=500, detail=error_msg)
 
-    # Return the full data including any metadata fields
     return store_data
 
 
+def load_store_yaml(store_id: str) -> dict:
+    """
+    Load and validate store YAML configuration
+    
+    Parsed files are cached until they change on disk. Callers get their own
+    deep copy, so they may modify it freely (e.g. before save_store_yaml).
+    """
+    # Demo store uses the same naming pattern as regular stores
+    yaml_file = f"stores/store{store_id}.yml"
+
+    try:
+        st = os.stat(yaml_file)
+    except FileNotFoundError:
+        error_msg = f"Store configuration file not found at {yaml_file}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=404, detail=error_msg)
+
+    # Return the full data including any metadata fields
+    return copy.deepcopy(_load_store_yaml_cached(yaml_file, st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=512)
+def _load_store_meta_cached(yaml_file: str, mtime_ns: int, size: int) -> dict:
+    """Parse store metadata; the file's mtime and size are part of the cache key"""
+    with open(yaml_file, "rb") as f:
+        try:
+            store_data = yaml.load(f, Loader=_YamlLoader)
+        except yaml.YAMLError as e:
+            logger.error(f"YAML parsing error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"YAML parsing error: {str(e)}")
+    
+    if not isinstance(store_data, dict):
+        return {}
+    return {key: value for key, value in store_data.items() if key != "boxes"}
+
+
+def load_store_meta(store_id: str) -> dict:
+    """
+    Load store metadata (name, description, ...) without the box list
+    
+    Results are cached until the file changes, so repeated lookups cost a
+    stat() instead of a YAML parse.
+    """
+    yaml_file = f"stores/store{store_id}.yml"
+    
+    try:
+        st = os.stat(yaml_file)
+    except FileNotFoundError:
+        error_msg = f"Store configuration file not found at {yaml_file}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=404, detail=error_msg)
+    
+    # Copy so callers can't modify the cached entry
+    return dict(_load_store_meta_cached(yaml_file, st.st_mtime_ns, st.st_size))
+
+
 def save_store_yaml(store_id: str, data: dict) -> bool:
-    """Save store data to YAML file with custom formatting"""
+    """
+    Save store data to YAML file with custom formatting
+    
+    The file is left untouched when its contents would not change. Otherwise
+    it is written to a temporary file and renamed over the original, so a
+    crash mid-write can't leave a truncated store file behind.
+    """
     # Demo store uses the same naming pattern as regular stores
     yaml_file = f"stores/store{store_id}.yml"
 
+    # Build the document in memory and write it in one call
+    parts = []
+    write = parts.append
+
     try:
         # Custom YAML writing to maintain the desired format
-        with open(yaml_file, "w") as f:
-            # Write store metadata if present
-            if "name" in data and data["name"]:
-                f.write(f"name: \"{data['name']}\"\n")
-            
-            if "description" in data and data["description"]:
-                f.write(f"description: \"{data['description']}\"\n")
-            
-            # Write start-screen if present
-            if "start-screen" in data:
-                f.write(f"start-screen: {str(data['start-screen']).lower()}\n")
-            
-            # Always write boxes key, even if empty
-            if not data.get("boxes"):
-                f.write("boxes: []\n")
-                return True
-            
-            f.write("boxes:\n")
+        # Write store metadata if present
+        if "name" in data and data["name"]:
+            write(f"name: {_quoted(data['name'])}\n")
+        
+        if "description" in data and data["description"]:
+            write(f"description: {_quoted(data['description'])}\n")
+        
+        # Write start-screen if present
+        if "start-screen" in data:
+            write(f"start-screen: {str(data['start-screen']).lower()}\n")
+        
+        # Always write boxes key, even if empty
+        if not data.get("boxes"):
+            write("boxes: []\n")
+        else:
+            write("boxes:\n")
 
-            # Write each box in a nice format
-            for box in data["boxes"]:
-                # Always write the type
-                f.write(f"  - type: {box['type']}\n")
+        # Write each box in a nice format
+        for box in data.get("boxes") or []:
+            # Always write the type
+            write(f"  - type: {box['type']}\n")
 
-                # Supplier field removed - no longer used
+            # Supplier field removed - no longer used
 
-                # Handle model field
-                if store_id == "1" and "model" not in box:
-                    # Skip model field for store1 if not present to maintain legacy format
-                    pass
-                else:
-                    model = box.get('model', f"Unknown-{box['dimensions'][0]}-{box['dimensions'][1]}-{box['dimensions'][2]}")
-                    f.write(f"    model: \"{model}\"\n")
-
-                # Safely format dimensions with square brackets and commas, no spaces
-                # Use a safer approach to prevent YAML injection
-                if isinstance(box['dimensions'], list) and len(box['dimensions']) == 3:
-                    dimensions = [normalize_float(float(d)) if isinstance(d, (int, float)) else 0 for d in box['dimensions']]
-                    # Format as inline array without spaces for compact format
-                    dimensions_str = "[" + ",".join(str(d) for d in dimensions) + "]"
-                    f.write(f"    dimensions: {dimensions_str}\n")
-                else:
-                    f.write(f"    dimensions: [0,0,0]\n")
-
-                # Add alternate_depths if present
-                if "alternate_depths" in box and isinstance(box['alternate_depths'], list):
-                    # Validate depths are numeric and reasonable
-                    alt_depths = [normalize_float(float(d)) if isinstance(d, (int, float)) and 0 <= d <= 100 else 0 for d in box['alternate_depths']]
-                    # Format as inline array without spaces for compact format
-                    alt_depths_str = "[" + ",".join(str(d) for d in alt_depths) + "]"
-                    f.write(f"    alternate_depths: {alt_depths_str}\n")
-
-                # Write itemized prices (only pricing mode now)
-                if "itemized-prices" in box:
-                    # Write itemized prices
-                    ip = box["itemized-prices"]
-                    f.write(f"    itemized-prices:\n")
-                    f.write(f"      box-price: {ip.get('box-price', 0)}\n")
-                    f.write(f"      basic-materials: {ip.get('basic-materials', 0)}\n")
-                    f.write(f"      basic-services: {ip.get('basic-services', 0)}\n")
-                    f.write(f"      standard-materials: {ip.get('standard-materials', 0)}\n")
-                    f.write(f"      standard-services: {ip.get('standard-services', 0)}\n")
-                    f.write(f"      fragile-materials: {ip.get('fragile-materials', 0)}\n")
-                    f.write(f"      fragile-services: {ip.get('fragile-services', 0)}\n")
-                    f.write(f"      custom-materials: {ip.get('custom-materials', 0)}\n")
-                    f.write(f"      custom-services: {ip.get('custom-services', 0)}\n")
-
-                # Add location if present
-                if store_id == "1" and "location" not in box:
-                    # Skip location field for store1 if not present to maintain legacy format
+            # Handle model field
+            if store_id == "1" and "model" not in box:
+                # Skip model field for store1 if not present to maintain legacy format
+                pass
+            else:
+                model = box.get('model', f"Unknown-{box['dimensions'][0]}-{box['dimensions'][1]}-{box['dimensions'][2]}")
+                write(f"    model: {_quoted(model)}\n")
+
+            # Safely format dimensions with square brackets and commas, no spaces
+            # Use a safer approach to prevent YAML injection
+            if isinstance(box['dimensions'], list) and len(box['dimensions']) == 3:
+                try:
+                    # All-numeric (the normal case): one C-level float conversion
+                    dimensions = array('d', box['dimensions'])
+                except TypeError:
+                    dimensions = [float(d) if isinstance(d, (int, float)) else 0 for d in box['dimensions']]
+                # Format as inline array without spaces for compact format
+                dimensions_str = "[" + ",".join(str(normalize_float(d)) for d in dimensions) + "]"
+                write(f"    dimensions: {dimensions_str}\n")
+            else:
+                write(f"    dimensions: [0,0,0]\n")
+
+            # Add alternate_depths if present
+            if "alternate_depths" in box and isinstance(box['alternate_depths'], list):
+                # Validate depths are numeric and reasonable
+                try:
+                    alt_depths = array('d', box['alternate_depths'])
+                except TypeError:
+                    alt_depths = [float(d) if isinstance(d, (int, float)) else -1 for d in box['alternate_depths']]
+                # Format as inline array without spaces for compact format
+                alt_depths_str = "[" + ",".join(str(normalize_float(d)) if 0 <= d <= 100 else "0" for d in alt_depths) + "]"
+                write(f"    alternate_depths: {alt_depths_str}\n")
+
+            # Write itemized prices (only pricing mode now)
+            if "itemized-prices" in box:
+                # Write itemized prices
+                ip = box["itemized-prices"]
+                write(f"    itemized-prices:\n")
+                write(f"      box-price: {ip.get('box-price', 0)}\n")
+                write(f"      basic-materials: {ip.get('basic-materials', 0)}\n")
+                write(f"      basic-services: {ip.get('basic-services', 0)}\n")
+                write(f"      standard-materials: {ip.get('standard-materials', 0)}\n")
+                write(f"      standard-services: {ip.get('standard-services', 0)}\n")
+                write(f"      fragile-materials: {ip.get('fragile-materials', 0)}\n")
+                write(f"      fragile-services: {ip.get('fragile-services', 0)}\n")
+                write(f"      custom-materials: {ip.get('custom-materials', 0)}\n")
+                write(f"      custom-services: {ip.get('custom-services', 0)}\n")
+
+            # Add location if present
+            if store_id == "1" and "location" not in box:
+                # Skip location field for store1 if not present to maintain legacy format
+                pass
+            else:
+                location = box.get('location', {})
+                
+                # Handle empty or None locations - skip entirely
+                if location is None or (isinstance(location, dict) and not location):
+                    # Skip empty locations completely
                     pass
-                else:
-                    location = box.get('location', {})
+                # Handle dictionary with coords
+                elif isinstance(location, dict) and 'coords' in location and location['coords']:
+                    # Start location section
+                    write(f"    location:\n")
                     
-                    # Handle empty or None locations - skip entirely
-                    if location is None or (isinstance(location, dict) and not location):
-                        # Skip empty locations completely
-                        pass
-                    # Handle dictionary with coords
-                    elif isinstance(location, dict) and 'coords' in location and location['coords']:
-                        # Start location section
-                        f.write(f"    location:\n")
-                        
-                        coords = location['coords']
-                        # Ensure coords are floats and valid
-                        if isinstance(coords, list) and len(coords) == 2:
-                            x = float(coords[0]) if isinstance(coords[0], (int, float)) else 0
-                            y = float(coords[1]) if isinstance(coords[1], (int, float)) else 0
-                            f.write(f"      coords: [{x}, {y}]\n")
-                    # Handle legacy string locations (skip completely)
-                    elif isinstance(location, str) and location.strip():
-                        # Skip legacy string locations
-                        pass
-
-                # Add MPOS_mapping if present
-                if "MPOS_mapping" in box and isinstance(box["MPOS_mapping"], dict):
-                    mapping = box["MPOS_mapping"]
-                    f.write(f"    MPOS_mapping:\n")
-                    # Write each mapping field if present
-                    for field in ["box", "basic_materials", "basic_service", 
-                                 "standard_materials", "standard_service",
-                                 "fragile_materials", "fragile_service", 
-                                 "custom_materials", "custom_service"]:
-                        if field in mapping:
-                            f.write(f"      {field}: {mapping[field]}\n")
-
-                f.write("\n")
+                    coords = location['coords']
+                    # Ensure coords are floats and valid
+                    if isinstance(coords, list) and len(coords) == 2:
+                        x = float(coords[0]) if isinstance(coords[0], (int, float)) else 0
+                        y = float(coords[1]) if isinstance(coords[1], (int, float)) else 0
+                        write(f"      coords: [{x}, {y}]\n")
+                # Handle legacy string locations (skip completely)
+                elif isinstance(location, str) and location.strip():
+                    # Skip legacy string locations
+                    pass
+
+            # Add MPOS_mapping if present
+            if "MPOS_mapping" in box and isinstance(box["MPOS_mapping"], dict):
+                mapping = box["MPOS_mapping"]
+                write(f"    MPOS_mapping:\n")
+                # Write each mapping field if present
+                for field in ["box", "basic_materials", "basic_service", 
+                             "standard_materials", "standard_service",
+                             "fragile_materials", "fragile_service", 
+                             "custom_materials", "custom_service"]:
+                    if field in mapping:
+                        write(f"      {field}: {mapping[field]}\n")
+
+            write("\n")
+
+        # Readers hand the raw bytes to libyaml, which expects UTF-8
+        payload = "".join(parts).encode("utf-8")
+        digest = _digest(payload)
+
+        # Skip the write if the file on disk still holds these exact contents
+        try:
+            st = os.stat(yaml_file)
+        except FileNotFoundError:
+            st = None
+        if st is not None and _file_digests.get(yaml_file) == (st.st_mtime_ns, st.st_size, digest):
+            return True
+
+        # Per-thread temp name so concurrent saves don't share a file
+        tmp_file = f"{yaml_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_file, yaml_file)
+        except BaseException:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            raise
+        finally:
+            # Rewrites can land within the filesystem's timestamp granularity
+            _load_store_yaml_cached.cache_clear()
+            _load_store_meta_cached.cache_clear()
+
+        if st is None:
+            # A new store file; make it visible to store_exists() right away
+            _invalidate_store_list()
+        st = os.stat(yaml_file)
+        _file_digests[yaml_file] = (st.st_mtime_ns, st.st_size, digest)
 
         return True
     except (IOError, OSError) as e:
@@ -175,24 +359,38 @@ def save_store_yaml(store_id: str, data: dict) -> bool:
         raise HTTPException(status_code=500, detail=f"Error saving YAML: {str(e)}")
 
 
+# Model patterns used by get_box_section
+_CUBE_SUFFIXES = ("C-UPS", "C", "Cube")
+_SMALL_MARKERS = ("X 4", "X 3", "X 6", "J-11", "J-14", "J-15", "J-16", "SHIRTB")
+_MEDIUM_MARKERS = ("J-20", "WREATH", "ST-6", "MIR-3", "MIR-8")
+_LARGE_MARKERS = ("J-64", "SUITCASE", "VCR", "24 X 18 X 18")
+_DIMENSIONS_MODEL_RE = re.compile(r'^(\d+)x(\d+)x(\d+)$')
+
+# One alternation per bucket scans the model once per bucket in C; buckets
+# stay separate because SMALL must win over MEDIUM, and MEDIUM over LARGE
+_SMALL_RE, _MEDIUM_RE, _LARGE_RE = (
+    re.compile("|".join(map(re.escape, markers)))
+    for markers in (_SMALL_MARKERS, _MEDIUM_MARKERS, _LARGE_MARKERS)
+)
+
+
 def get_box_section(model: str, box_type: Optional[str] = None) -> str:
     """Define box sections based on model patterns or box type"""
     # First try to categorize based on model if it exists
     if model and model.strip():
-        if any(model.endswith(suffix) for suffix in ["C-UPS", "C", "Cube"]):
+        if model.endswith(_CUBE_SUFFIXES):
             return "CUBE"
-        elif any(x in model for x in ["X 4", "X 3", "X 6", "J-11", "J-14", "J-15", "J-16", "SHIRTB"]):
+        elif _SMALL_RE.search(model):
             return "SMALL"
-        elif any(x in model for x in ["J-20", "WREATH", "ST-6", "MIR-3", "MIR-8"]):
+        elif _MEDIUM_RE.search(model):
             return "MEDIUM"
-        elif any(x in model for x in ["J-64", "SUITCASE", "VCR", "24 X 18 X 18"]):
+        elif _LARGE_RE.search(model):
             return "LARGE"
         else:
             # Check if dimensions indicate a cube (all dimensions equal)
             # Model might be like "22x22x22" or "22 X 22 X 22"
-            import re
             normalized_model = model.lower().replace(" ", "")
-            match = re.match(r'^(\d+)x(\d+)x(\d+)$', normalized_model)
+            match = _DIMENSIONS_MODEL_RE.match(normalized_model)
             if match and match.group(1) == match.group(2) == match.group(3):
                 return "CUBE"
             return "SPECIALTY"
@@ -268,17 +466,31 @@ def validate_box_data(box_data: dict, store_id: str) -> None:
                 raise ValueError("Box has invalid value in 'alternate_depths' (must be numbers)")
 
 
+# (mtime_ns, size) of the last packing_guidelines.yml that passed validation
+_validated_guidelines: Optional[Tuple[int, int]] = None
+
+
 def validate_packing_guidelines():
-    """Validate packing_guidelines.yml exists and has required structure - dies on error"""
+    """
+    Validate packing_guidelines.yml exists and has required structure - dies on error
+    
+    Meant for startup. Repeat calls are a stat() until the file changes.
+    """
+    global _validated_guidelines
     guidelines_path = "stores/packing_guidelines.yml"
     
-    if not os.path.exists(guidelines_path):
+    try:
+        st = os.stat(guidelines_path)
+    except FileNotFoundError:
         logger.critical(f"{guidelines_path} not found!")
         sys.exit(1)
     
+    if _validated_guidelines == (st.st_mtime_ns, st.st_size):
+        return
+    
     try:
         with open(guidelines_path) as f:
-            guidelines = yaml.safe_load(f)
+            guidelines = yaml.load(f, Loader=_YamlLoader)
         
         # Validate recommendation engine config
         if 'recommendation_engine' not in guidelines:
@@ -306,7 +518,7 @@ def validate_packing_guidelines():
                 logger.critical(f"{guidelines_path} missing weight '{weight}'!")
                 sys.exit(1)
                 
-        weight_sum = weights.get('price', 0) + weights.get('efficiency', 0) + weights.get('ease', 0)
+        weight_sum = sum(weights.get(weight, 0) for weight in required_weights)
         if abs(weight_sum - 1.0) > 0.001:
             logger.critical(f"Weights in {guidelines_path} must sum to 1.0 (current: {weight_sum})")
             sys.exit(1)
@@ -355,6 +567,7 @@ def validate_packing_guidelines():
                     sys.exit(1)
                 
         logger.info(f"{guidelines_path} validated successfully")
+        _validated_guidelines = (st.st_mtime_ns, st.st_size)
         
     except yaml.YAMLError as e:
         logger.critical(f"Failed to parse {guidelines_path}: {e}")
@@ -3,6 +3,7 @@ import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
@@ -11,17 +12,12 @@ from backend.lib.yaml_helpers import validate_packing_guidelines
 from backend.lib.rate_limiter import limiter
 from backend.lib.auth_middleware import get_optional_auth_with_demo
 from backend.lib.rate_limit_dedup import cleanup_old_attempts
+from backend.lib.excel_import import shutdown_excel_pool
 from backend.routers import auth, boxes, floorplan, general, import_export, library, packing
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Initialize the authentication database
-init_db()
-
-# Validate packing guidelines on startup - dies if invalid
-validate_packing_guidelines()
-
 
 async def cleanup_rate_limit_task():
     """Background task to clean up old rate limit attempts"""
@@ -42,7 +38,13 @@ async def cleanup_rate_limit_task():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan - startup and shutdown tasks"""
-    # Startup
+    # Startup - runs once per server process rather than on every import
+    # Initialize the authentication database
+    init_db()
+    
+    # Validate packing guidelines on startup - dies if invalid
+    validate_packing_guidelines()
+    
     cleanup_task = asyncio.create_task(cleanup_rate_limit_task())
     
     yield
@@ -53,13 +55,16 @@ async def lifespan(app: FastAPI):
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    
+    shutdown_excel_pool()
 
 
 app = FastAPI(
     title="BoxChooser API",
     description="API backend for packing optimization application",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add rate limiter to app
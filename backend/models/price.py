@@ -2,11 +2,7 @@ from typing import Dict
 from pydantic import BaseModel
 
 
-class PriceUpdateRequest(BaseModel):
-    changes: Dict[str, Dict[str, float]]
-    csrf_token: str
-
-
 class ItemizedPriceUpdateRequest(BaseModel):
+    """Request model for itemized price updates"""
     changes: Dict[str, Dict[str, float]]
-    csrf_token: str
\ No newline at end of file
+    csrf_token: str
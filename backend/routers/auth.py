@@ -1,3 +1,4 @@
+import asyncio
 import os
 import re
 import shutil
@@ -5,11 +6,13 @@ from datetime import datetime, timezone
 from typing import Optional, Tuple
 
 import yaml
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Header, Request
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from backend.lib.auth_middleware import get_current_store, get_optional_auth, get_current_auth, get_optional_auth_with_demo
+from backend.lib.auth_middleware import bearer_scheme, get_current_store, get_optional_auth, get_optional_auth_with_demo, get_current_admin
+from backend.lib.store_params import StoreId
+from backend.lib.yaml_helpers import load_yaml, store_exists
 from backend.lib.auth_manager import (
     verify_pin, create_session, delete_session,
     hasAuth as store_has_auth, get_db, get_store_info,
@@ -41,17 +44,14 @@ async def login(request: Request, login_request: LoginRequest):
     # Always return the same error to prevent enumeration
     generic_error = HTTPException(status_code=401, detail="Invalid store ID or PIN")
     
-    # Verify store exists
-    yaml_file = f"stores/store{login_request.store_id}.yml"
-    if not os.path.exists(yaml_file):
-        raise generic_error
-    
-    # Check if store has auth configured
-    if not store_has_auth(login_request.store_id):
+    # Verify PIN first (bcrypt is CPU-bound; keep it off the event loop).
+    # verify_pin costs the same whether or not the store has auth, so
+    # unknown and misconfigured stores fail in the same time as a wrong PIN
+    if not await asyncio.to_thread(verify_pin, login_request.store_id, login_request.pin):
         raise generic_error
     
-    # Verify PIN
-    if not verify_pin(login_request.store_id, login_request.pin):
+    # Verify store exists
+    if not store_exists(login_request.store_id):
         raise generic_error
     
     # Create session token
@@ -71,20 +71,14 @@ async def send_code(request: Request, code_request: EmailCodeRequest):
     generic_response = {"message": "If the store ID and email are valid, a verification code has been sent"}
     
     # Verify store exists
-    yaml_file = f"stores/store{code_request.store_id}.yml"
-    if not os.path.exists(yaml_file):
-        return generic_response
-    
-    # Check if store has auth configured
-    if not store_has_auth(code_request.store_id):
+    if not store_exists(code_request.store_id):
         return generic_response
     
     try:
-        # Create verification code
+        # Create verification code (raises ValueError when the store has no
+        # auth configured or the email does not match)
         code = create_email_verification_code(code_request.store_id, code_request.email)
         
-        # Get store info for name
-        store_info = get_store_info(code_request.store_id)
         store_name = f"Store {code_request.store_id}"
         
         # Send email
@@ -122,14 +116,13 @@ async def verify_code(request: Request, verify_request: VerifyCodeRequest):
 
 @router.post("/logout")
 async def logout(
-    auth_header: str = Header(None, alias="Authorization"),
-    token: str = Depends(get_current_store)
+    store_id: str = Depends(get_current_store),
+    token: Optional[str] = Depends(bearer_scheme)
 ):
     """Logout and invalidate token"""
-    # Token is extracted by get_current_store, but we need the raw token
-    if auth_header and auth_header.startswith("Bearer "):
-        token = auth_header[7:]
-        delete_session(token)
+    # get_current_store has already validated the token; the shared bearer
+    # scheme hands us the raw value (resolved once per request)
+    delete_session(token)
     
     return {"message": "Logged out successfully"}
 
@@ -140,15 +133,11 @@ router_store = APIRouter(prefix="/api/store/{store_id}", tags=["store-auth"])
 
 @router_store.get("/pin")
 async def get_pin_info(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    store_id: StoreId,
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Get PIN info (admin only)"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin access
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    auth_store_id, _ = auth_info
     
     # Verify access to this store
     if auth_store_id != store_id:
@@ -167,15 +156,11 @@ async def get_pin_info(
 
 @router_store.post("/regenerate-pin")
 async def regenerate_pin_endpoint(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    store_id: StoreId,
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Regenerate PIN for a store (admin only)"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin access
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    auth_store_id, _ = auth_info
     
     # Verify access to this store
     if auth_store_id != store_id:
@@ -184,7 +169,7 @@ async def regenerate_pin_endpoint(
     if not store_has_auth(store_id):
         raise HTTPException(status_code=404, detail="Store not found")
     
-    new_pin = regenerate_pin(store_id)
+    new_pin = await asyncio.to_thread(regenerate_pin, store_id)
     
     return {
         "pin": new_pin,
@@ -194,15 +179,11 @@ async def regenerate_pin_endpoint(
 
 @router_store.get("/info")
 async def get_store_info_endpoint(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    store_id: StoreId,
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Get store info including admin email (admin only)"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin access
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    auth_store_id, _ = auth_info
     
     # Verify access to this store
     if auth_store_id != store_id:
@@ -222,35 +203,30 @@ async def get_store_info_endpoint(
 
 @router_store.put("/admin-email")
 async def update_admin_email(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     request: UpdateEmailRequest = Body(...),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Update admin email for a store (admin only)"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin access
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    auth_store_id, _ = auth_info
     
     # Verify access to this store
     if auth_store_id != store_id:
         raise HTTPException(status_code=403, detail=f"Not authorized to access store {store_id}")
     
-    if not store_has_auth(store_id):
-        raise HTTPException(status_code=404, detail="Store not found")
-    
     # Validate email format
     email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     if not re.match(email_regex, request.email):
         raise HTTPException(status_code=400, detail="Invalid email format")
     
-    # Update the email in the database
+    # Update the email in the database; no matching row means no auth configured
     with get_db() as db:
-        db.execute(
+        cursor = db.execute(
             "UPDATE store_auth SET admin_email = ?, updated_at = CURRENT_TIMESTAMP WHERE store_id = ?",
             (request.email, store_id)
         )
+        if cursor.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Store not found")
         db.commit()
     
     return {
@@ -260,7 +236,7 @@ async def update_admin_email(
 
 
 @router_store.get("/has-auth")
-async def check_has_auth(store_id: str = Path(..., regex=r"^\d{1,6}$")):
+async def check_has_auth(store_id: StoreId):
     """Check if store has authentication enabled"""
     # Since all stores now require auth, always return true
     # This prevents store enumeration via 404 errors
@@ -291,7 +267,7 @@ async def demo_login(request: DemoLoginRequest):
         # Read the YAML to check demo_last_reset
         try:
             with open(demo_store_path, 'r') as f:
-                data = yaml.safe_load(f)
+                data = load_yaml(f)
             
             if 'demo_last_reset' not in data:
                 # Case B: demo_last_reset is unset
@@ -328,7 +304,7 @@ async def demo_login(request: DemoLoginRequest):
         
         # Add reset timestamp
         with open(demo_store_path, 'r') as f:
-            data = yaml.safe_load(f)
+            data = load_yaml(f)
         data['demo_last_reset'] = datetime.now(timezone.utc).isoformat()
         with open(demo_store_path, 'w') as f:
             yaml.dump(data, f, sort_keys=False)
@@ -364,7 +340,7 @@ async def demo_reset():
     
     # Add reset timestamp
     with open(demo_path, 'r') as f:
-        data = yaml.safe_load(f)
+        data = load_yaml(f)
     data['demo_last_reset'] = datetime.now(timezone.utc).isoformat()
     with open(demo_path, 'w') as f:
         yaml.dump(data, f, sort_keys=False)
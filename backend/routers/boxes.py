@@ -7,20 +7,21 @@ docs/authentication-api-patterns.md - using dependency injection with
 get_current_auth() for consistent authentication and authorization.
 """
 
+import asyncio
 import json
 import logging
-import os
 from typing import Dict, Any, Optional, List, Tuple
 
-import yaml
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, validator
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, field_validator
 
-from backend.lib.auth_middleware import get_current_auth
+from backend.lib.auth_middleware import get_current_auth, get_current_admin
+from backend.lib.store_params import StoreId
 from typing import Tuple
-from backend.lib.yaml_helpers import load_store_yaml, save_store_yaml, get_box_section, validate_box_data
+from backend.lib.yaml_helpers import load_yaml, load_store_yaml, load_store_meta, save_store_yaml, get_box_section, validate_box_data
 from backend.lib.box_analytics import BoxAnalytics
+from backend.models.price import ItemizedPriceUpdateRequest
 from pathlib import Path as PathLib
 
 # Set up logging
@@ -29,11 +30,15 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/store/{store_id}", tags=["boxes"])
 
 
+def _read_yaml_file(yaml_file: str):
+    """Read and parse a YAML file"""
+    with open(yaml_file, "r") as f:
+        return load_yaml(f)
 
 
-@router.get("/info", response_class=JSONResponse)
+@router.get("/info", response_class=ORJSONResponse)
 async def get_store_info(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     auth_info: Tuple[str, str] = Depends(get_current_auth())
 ):
     """Get store configuration info including price group"""
@@ -42,16 +47,16 @@ async def get_store_info(
     if auth_store_id != store_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    data = load_store_yaml(store_id)
+    meta = load_store_meta(store_id)
     return {
         "store_id": store_id,
-        "name": data.get("name", "")
+        "name": meta.get("name", "")
     }
 
 
-@router.get("/boxes", response_class=JSONResponse)
+@router.get("/boxes", response_class=ORJSONResponse)
 async def get_boxes(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     auth_info: Tuple[str, str] = Depends(get_current_auth())
 ):
     """Get all boxes for a store with validation"""
@@ -61,15 +66,14 @@ async def get_boxes(
         raise HTTPException(status_code=403, detail="Access denied")
     yaml_file = f"stores/store{store_id}.yml"
 
-    if not os.path.exists(yaml_file):
+    # File I/O and YAML parsing block, so keep them off the event loop
+    try:
+        boxes_data = await asyncio.to_thread(_read_yaml_file, yaml_file)
+    except FileNotFoundError:
         error_msg = f"Store configuration file not found at {yaml_file}"
         raise HTTPException(status_code=404, detail=error_msg)
-
-    with open(yaml_file, "r") as f:
-        try:
-            boxes_data = yaml.safe_load(f)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"YAML parsing error: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"YAML parsing error: {str(e)}")
 
     # Validate the structure of the YAML data
     if not boxes_data or "boxes" not in boxes_data or not isinstance(boxes_data["boxes"], list):
@@ -86,9 +90,9 @@ async def get_boxes(
     return boxes_data
 
 
-@router.get("/boxes_with_sections", response_class=JSONResponse)
+@router.get("/boxes_with_sections", response_class=ORJSONResponse)
 async def get_boxes_with_sections(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     auth_info: Tuple[str, str] = Depends(get_current_auth())
 ):
     """Get boxes formatted for the editor with sections"""
@@ -149,9 +153,9 @@ async def get_boxes_with_sections(
     return result
 
 
-@router.get("/all_boxes", response_class=JSONResponse)
+@router.get("/all_boxes", response_class=ORJSONResponse)
 async def get_all_boxes(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     auth_info: Tuple[str, str] = Depends(get_current_auth())
 ):
     """Get all boxes at once (bulk endpoint)"""
@@ -169,9 +173,9 @@ async def get_all_boxes(
     return {"boxes": data["boxes"]}
 
 
-@router.get("/box/{model}", response_class=JSONResponse)
+@router.get("/box/{model}", response_class=ORJSONResponse)
 async def get_box_by_model(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     model: str = Path(...),
     auth_info: Tuple[str, str] = Depends(get_current_auth())
 ):
@@ -199,28 +203,14 @@ async def get_box_by_model(
     raise HTTPException(status_code=404, detail=f"Box with model {model} not found")
 
 
-
-
-class ItemizedPriceUpdateRequest(BaseModel):
-    """Request model for itemized price updates"""
-    changes: Dict[str, Dict[str, float]]
-    csrf_token: str
-
-
-
-
-@router.post("/update_itemized_prices", response_class=JSONResponse)
+@router.post("/update_itemized_prices", response_class=ORJSONResponse)
 async def update_itemized_prices(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     update_data: ItemizedPriceUpdateRequest = Body(...),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Update itemized prices for multiple boxes"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin access
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    auth_store_id, _ = auth_info
     
     # Verify access to this store
     if auth_store_id != store_id:
@@ -288,19 +278,15 @@ class LocationUpdateRequest(BaseModel):
     location: Optional[Dict[str, Any]]
 
 
-@router.put("/box/{model}/location", response_class=JSONResponse)
+@router.put("/box/{model}/location", response_class=ORJSONResponse)
 async def update_box_location(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     model: str = Path(...),
     location_data: LocationUpdateRequest = Body(...),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Update location for a specific box"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin access
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    auth_store_id, _ = auth_info
     
     # Verify access to this store
     if auth_store_id != store_id:
@@ -332,18 +318,14 @@ async def update_box_location(
     return {"message": "Location updated successfully"}
 
 
-@router.delete("/box/{model}", response_class=JSONResponse)
+@router.delete("/box/{model}", response_class=ORJSONResponse)
 async def delete_box(
+    store_id: StoreId,
     model: str = Path(...),
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Delete a box from the store inventory"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin access
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    auth_store_id, _ = auth_info
     
     # Verify access to this store
     if auth_store_id != store_id:
@@ -370,27 +352,30 @@ async def delete_box(
 class CreateBoxRequest(BaseModel):
     """Request model for creating a new box"""
     model: str = Field(..., min_length=1, max_length=50, description="Box model identifier")
-    dimensions: List[float] = Field(..., min_items=3, max_items=3, description="Box dimensions [L, W, H]")
-    alternate_depths: Optional[List[float]] = Field(None, max_items=10, description="Alternate depths for prescoring")
+    dimensions: List[float] = Field(..., min_length=3, max_length=3, description="Box dimensions [L, W, H]")
+    alternate_depths: Optional[List[float]] = Field(None, max_length=10, description="Alternate depths for prescoring")
     location: Optional[Dict[str, Any]] = None
     notes: Optional[str] = Field(None, max_length=500, description="Additional notes")
     # Analytics tracking fields
     from_library: bool = Field(False, description="Whether box was imported from library")
     offered_names: Optional[List[str]] = Field(None, description="Names offered from library")
     
-    @validator('dimensions', each_item=True)
+    @field_validator('dimensions')
+    @classmethod
     def validate_dimensions(cls, v):
-        if not 0.1 <= v <= 1000:
+        if not all(0.1 <= d <= 1000 for d in v):
             raise ValueError('Dimensions must be between 0.1 and 1000 inches')
         return v
     
-    @validator('alternate_depths', each_item=True)
+    @field_validator('alternate_depths')
+    @classmethod
     def validate_alternate_depths(cls, v):
-        if v is not None and not 0.1 <= v <= 1000:
+        if v is not None and not all(0.1 <= d <= 1000 for d in v):
             raise ValueError('Alternate depths must be between 0.1 and 1000 inches')
         return v
     
-    @validator('model')
+    @field_validator('model')
+    @classmethod
     def validate_model_no_special_chars(cls, v):
         # Basic sanitization - no SQL special characters
         if any(char in v for char in [';', '--', '/*', '*/', '\x00']):
@@ -398,18 +383,14 @@ class CreateBoxRequest(BaseModel):
         return v
 
 
-@router.post("/boxes/batch", response_class=JSONResponse)
+@router.post("/boxes/batch", response_class=ORJSONResponse)
 async def create_boxes_batch(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     boxes: List[CreateBoxRequest] = Body(...),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Add multiple boxes to the store inventory in one request"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin access
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    auth_store_id, _ = auth_info
     
     # Verify access to this store
     if auth_store_id != store_id:
@@ -496,18 +477,14 @@ async def create_boxes_batch(
         "boxes": added_boxes
     }
 
-@router.post("/box", response_class=JSONResponse)
+@router.post("/box", response_class=ORJSONResponse)
 async def create_box(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     box_data: CreateBoxRequest = Body(...),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Add a new box to the store inventory"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin access
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+    auth_store_id, _ = auth_info
     
     # Verify access to this store
     if auth_store_id != store_id:
@@ -600,7 +577,7 @@ class BoxModificationRequest(BaseModel):
     modification_type: str
     
 
-@router.post("/stats/box-modification", response_class=JSONResponse)
+@router.post("/stats/box-modification", response_class=ORJSONResponse)
 async def track_box_modification(
     request: BoxModificationRequest = Body(...),
     auth_info: Tuple[str, str] = Depends(get_current_auth())
@@ -612,8 +589,6 @@ async def track_box_modification(
     if not auth_store_id:
         raise HTTPException(status_code=401, detail="Authentication required")
     
-    # Import BoxAnalytics
-    from backend.lib.box_analytics import BoxAnalytics
     analytics = BoxAnalytics()
     
     # Determine modification type
@@ -641,9 +616,9 @@ async def track_box_modification(
     return {"message": "Modification tracked successfully"}
 
 
-@router.get("/stats", response_class=JSONResponse)
+@router.get("/stats", response_class=ORJSONResponse)
 async def get_store_stats(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     auth_info: Tuple[str, str] = Depends(get_current_auth())
 ):
     """Get store setup statistics for the getting started page"""
@@ -694,21 +669,18 @@ async def get_store_stats(
     }
 
 
-@router.post("/complete-setup", response_class=JSONResponse)
+@router.post("/complete-setup", response_class=ORJSONResponse)
 async def complete_setup(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    store_id: StoreId,
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Mark the getting started setup as complete"""
-    auth_store_id, auth_level = auth_info
+    auth_store_id, _ = auth_info
     
-    # Verify user has access to this store and is admin
+    # Verify user has access to this store
     if auth_store_id != store_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    if auth_level != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     # Load store data
     store_data = load_store_yaml(store_id)
     
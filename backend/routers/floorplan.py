@@ -4,25 +4,58 @@ Handles uploading floorplans and managing box locations on the floorplan.
 """
 
 import os
-from typing import Dict, Union, Any, Tuple
+import time
+from typing import Dict, FrozenSet, Union, Any, Tuple
 from io import BytesIO
 
 import aiofiles
-from fastapi import APIRouter, Depends, File, HTTPException, Path, UploadFile, Body
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, Body
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
 from PIL import Image
 
 from backend.lib.auth_middleware import get_current_store, get_current_auth_with_demo, get_current_auth
+from backend.lib.store_params import StoreId
 from backend.lib.yaml_helpers import load_store_yaml, save_store_yaml
 
 
 router = APIRouter(prefix="/api/store/{store_id}", tags=["floorplan"])
 
+# (directory, mtime_ns, file names) from the last scan of the floorplans directory
+_floorplan_listing: Tuple[str, int, FrozenSet[str]] = ("", -1, frozenset())
+
+
+def _floorplan_files(floorplan_dir: str) -> FrozenSet[str]:
+    """
+    Names of the files in the floorplans directory
+    
+    Adding or removing a file changes the directory's mtime, so the listing
+    is only rescanned when that changes: one stat() per lookup instead of
+    one per candidate file name.
+    
+    A listing taken within a second of the last change is not reused, since
+    a second change in the same timestamp tick would go unnoticed.
+    """
+    global _floorplan_listing
+    
+    try:
+        mtime_ns = os.stat(floorplan_dir).st_mtime_ns
+    except FileNotFoundError:
+        return frozenset()
+    
+    cached_dir, cached_mtime_ns, names = _floorplan_listing
+    if cached_dir != floorplan_dir or cached_mtime_ns != mtime_ns:
+        scanned_at_ns = time.time_ns()
+        with os.scandir(floorplan_dir) as entries:
+            names = frozenset(entry.name for entry in entries)
+        if scanned_at_ns - mtime_ns > 1_000_000_000:
+            _floorplan_listing = (floorplan_dir, mtime_ns, names)
+    return names
+
 
 @router.get("/floorplan", response_class=FileResponse)
 async def get_floorplan(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),  # Allow 6 digits for demo
+    store_id: StoreId,
     auth: Tuple[str, str] = Depends(get_current_auth())
 ):
     """Get the floorplan image for a store"""
@@ -33,10 +66,12 @@ async def get_floorplan(
     floorplan_dir = "floorplans"
     extensions = ['.png', '.jpg', '.jpeg']
     
+    existing_files = _floorplan_files(floorplan_dir)
+    
     # Special handling for demo store
     if store_id == "999999":
-        demo_path = os.path.join(floorplan_dir, "demo_floor.png")
-        if os.path.exists(demo_path):
+        if "demo_floor.png" in existing_files:
+            demo_path = os.path.join(floorplan_dir, "demo_floor.png")
             return FileResponse(
                 demo_path,
                 media_type="image/png",
@@ -52,8 +87,8 @@ async def get_floorplan(
         ]
         
         for pattern in patterns:
-            file_path = os.path.join(floorplan_dir, pattern)
-            if os.path.exists(file_path):
+            if pattern in existing_files:
+                file_path = os.path.join(floorplan_dir, pattern)
                 return FileResponse(
                     file_path,
                     media_type=f"image/{ext[1:]}",
@@ -66,7 +101,7 @@ async def get_floorplan(
 
 @router.post("/floorplan")
 async def upload_floorplan(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),  # Allow 6 digits for demo store
+    store_id: StoreId,
     file: UploadFile = File(...),
     auth_info: dict = get_current_auth_with_demo()
 ):
@@ -169,9 +204,9 @@ async def upload_floorplan(
     }
 
 
-@router.get("/box-locations", response_class=JSONResponse)
+@router.get("/box-locations", response_class=ORJSONResponse)
 async def get_box_locations(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),  # Allow 6 digits for demo
+    store_id: StoreId,
     auth: Tuple[str, str] = Depends(get_current_auth())
 ):
     """Get all box locations for mapping"""
@@ -216,9 +251,9 @@ class LocationUpdateRequest(BaseModel):
     csrf_token: str
 
 
-@router.post("/update-locations", response_class=JSONResponse)
+@router.post("/update-locations", response_class=ORJSONResponse)
 async def update_locations(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),  # Allow 6 digits for demo
+    store_id: StoreId,
     update_data: LocationUpdateRequest = Body(...),
     auth_info: dict = get_current_auth_with_demo()
 ):
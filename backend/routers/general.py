@@ -1,27 +1,34 @@
-import os
+import asyncio
 
-import yaml
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from typing import Tuple
 from backend.lib.auth_middleware import get_current_auth
+from backend.lib.yaml_helpers import load_yaml
 
 
 router = APIRouter(tags=["general"])
 
+GUIDELINES_PATH = "stores/packing_guidelines.yml"
 
-@router.get("/api/packing-guidelines", response_class=JSONResponse)
+
+def _read_guidelines():
+    """Read and parse the packing guidelines file"""
+    with open(GUIDELINES_PATH, "rb") as f:
+        return load_yaml(f)
+
+
+@router.get("/api/packing-guidelines", response_class=ORJSONResponse)
 async def get_packing_guidelines(
-    auth: Tuple[str, str] = Depends(get_current_auth)
+    auth: Tuple[str, str] = Depends(get_current_auth())
 ):
     """Get packing guidelines"""
     # Note: This returns global guidelines, not store-specific
     # Any authenticated user can access these
-    guidelines_path = "stores/packing_guidelines.yml"
-    if not os.path.exists(guidelines_path):
+    # File I/O and YAML parsing block, so keep them off the event loop
+    try:
+        guidelines = await asyncio.to_thread(_read_guidelines)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Packing guidelines not found")
     
-    with open(guidelines_path) as f:
-        guidelines = yaml.safe_load(f)
-    
     return guidelines
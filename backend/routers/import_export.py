@@ -1,13 +1,15 @@
 from typing import Any, Dict, Optional, Tuple
 
-from fastapi import APIRouter, Body, Depends, File, HTTPException, Path, UploadFile
+from fastapi import APIRouter, Body, Depends, File, HTTPException, UploadFile
 from fastapi.responses import JSONResponse
 
 from backend.lib.auth_middleware import get_current_store, get_current_auth
+from backend.lib.store_params import StoreId
+from backend.lib.box_analytics import BoxAnalytics
 from backend.lib.excel_import import (
     export_prices_to_excel, import_prices_from_excel,
     analyze_excel_structure, analyze_import_for_matching,
-    apply_import_updates, discover_boxes_from_prices
+    apply_import_updates, discover_boxes_from_prices, get_cached_price_sheet
 )
 from backend.lib.yaml_helpers import load_store_yaml, save_store_yaml
 
@@ -16,7 +18,7 @@ router = APIRouter(prefix="/api/store/{store_id}", tags=["import-export"])
 
 @router.get("/export_prices")
 async def export_prices(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     auth_store_id: str = Depends(get_current_store)
 ):
     """Export prices to Excel"""
@@ -27,7 +29,7 @@ async def export_prices(
 
 @router.post("/import_prices")
 async def import_prices(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     file: UploadFile = File(...),
     auth_store_id: str = Depends(get_current_store)
 ):
@@ -39,7 +41,7 @@ async def import_prices(
 
 @router.post("/import/analyze")
 async def analyze_import(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     file: UploadFile = File(...),
     auth_store_id: str = Depends(get_current_store)
 ):
@@ -51,7 +53,7 @@ async def analyze_import(
 
 @router.post("/import/apply")
 async def apply_import(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     updates: Dict[str, Any] = Body(...),
     auth_store_id: str = Depends(get_current_store)
 ):
@@ -65,18 +67,38 @@ async def apply_import(
 
 @router.get("/import/excel-items")
 async def get_excel_items(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    dimension_filter: Optional[str] = None
+    store_id: StoreId,
+    dimension_filter: Optional[str] = None,
+    analysis_id: Optional[str] = None,
+    auth_info: Tuple[str, str] = Depends(get_current_auth())
 ):
     """
     Get Excel items from the last analyzed import, optionally filtered by dimension
+    
+    Items come from the sheet cached by /import/analyze; pass its analysis_id
+    to pick a specific upload, otherwise the store's latest analysis is used.
+    dimension_filter matches either integer ("10x10x10") or exact
+    ("10.5x10x10") dimension strings.
     """
-    # This would typically be cached from the analyze step
-    # For now, return empty as this requires session management
-    return {
-        'items': [],
-        'message': 'Excel items would be cached from analyze step'
-    }
+    auth_store_id, auth_level = auth_info
+    
+    # Verify user has access to this store
+    if auth_store_id != store_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    sheet = get_cached_price_sheet(store_id, analysis_id)
+    if sheet is None:
+        return {
+            'items': [],
+            'message': 'No cached analysis found - upload the price sheet to /import/analyze again'
+        }
+    
+    if dimension_filter:
+        items = sheet['groups'].get(dimension_filter) or sheet['groups_exact'].get(dimension_filter, [])
+    else:
+        items = [item for group in sheet['groups_exact'].values() for item in group]
+    
+    return {'items': items}
 
 
 # General Excel analysis endpoint
@@ -95,7 +117,7 @@ async def analyze_excel(
 
 @router.post("/discover_boxes")
 async def discover_boxes(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     file: UploadFile = File(...),
     auth_info: Tuple[str, str] = Depends(get_current_auth())
 ):
@@ -128,7 +150,6 @@ async def discover_boxes(
     results = await discover_boxes_from_prices(file, store_data)
     
     # Track discovery analytics
-    from backend.lib.box_analytics import BoxAnalytics
     analytics = BoxAnalytics()
     
     # Log discovery session
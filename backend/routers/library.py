@@ -1,51 +1,72 @@
 """Box library endpoints - vendor-agnostic box catalog"""
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from backend.lib.auth_middleware import get_current_auth
 from backend.lib.box_library import get_box_library
-from typing import Tuple, Dict
+from backend.lib.http_cache import cached_json_response
 
-router = APIRouter(prefix="/api/boxes/library", tags=["library"])
+# Every library endpoint requires authentication (any level) but none needs
+# the session itself, so the check is attached once to the router
+router = APIRouter(
+    prefix="/api/boxes/library",
+    tags=["library"],
+    dependencies=[Depends(get_current_auth())]
+)
 
 
 class BoxCheckRequest(BaseModel):
     """Request model for checking if a box exists in library"""
-    dimensions: List[float] = Field(..., min_items=3, max_items=3)
-    alternate_depths: Optional[List[float]] = Field(None, max_items=10)
+    dimensions: List[float] = Field(..., min_length=3, max_length=3)
+    alternate_depths: Optional[List[float]] = Field(None, max_length=10)
     
-    @validator('dimensions', each_item=True)
-    def dimensions_must_be_positive(cls, v):
-        if v <= 0:
-            raise ValueError('Each dimension must be greater than 0')
-        if v > 1000:
-            raise ValueError('Each dimension must be less than 1000 inches')
+    @field_validator('dimensions')
+    @classmethod
+    def dimensions_must_be_in_range(cls, v):
+        for d in v:
+            if d <= 0:
+                raise ValueError('Each dimension must be greater than 0')
+            if d > 1000:
+                raise ValueError('Each dimension must be less than 1000 inches')
         return v
     
-    @validator('alternate_depths', each_item=True)
+    @field_validator('alternate_depths')
+    @classmethod
     def alternate_depths_must_be_positive(cls, v):
-        if v is not None and v <= 0:
+        if v is not None and not all(d > 0 for d in v):
             raise ValueError('Each alternate depth must be greater than 0')
         return v
     
-    @validator('alternate_depths')
-    def validate_alternate_depths(cls, v, values):
-        if v is None:
-            return v
-        if 'dimensions' in values and values['dimensions']:
-            depth = values['dimensions'][2] if len(values['dimensions']) > 2 else None
-            if depth:
-                invalid_depths = [d for d in v if d >= depth]
-                if invalid_depths:
-                    raise ValueError(f'Alternate depths {invalid_depths} must be less than box depth {depth}')
-        return v
+    @model_validator(mode='after')
+    def alternate_depths_below_depth(self):
+        # Runs only once both fields have passed their own validation
+        if self.alternate_depths:
+            depth = self.dimensions[2]
+            invalid_depths = [d for d in self.alternate_depths if d >= depth]
+            if invalid_depths:
+                raise ValueError(f'Alternate depths {invalid_depths} must be less than box depth {depth}')
+        return self
 
 
-@router.get("", response_model=List[dict])
+# The handler returns pre-serialized bytes (or a 304), so nothing is validated
+# on the way out; the schema is declared for the docs only
+@router.get(
+    "",
+    response_class=Response,
+    responses={
+        200: {
+            "description": "All library boxes",
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"type": "object"}}}
+            },
+        },
+        304: {"description": "Library unchanged since the If-None-Match ETag"},
+    },
+)
 async def get_library_boxes(
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
-) -> List[dict]:
+    request: Request
+) -> Response:
     """
     Get all boxes from the library
     
@@ -53,15 +74,15 @@ async def get_library_boxes(
     Requires authentication (any level).
     """
     library = get_box_library()
-    return library.boxes
+    # The payload is serialized once per library load
+    return cached_json_response(request, library.boxes_json, library.boxes_etag)
 
 
 
 
 @router.post("/check")
 async def check_box_exists(
-    request: BoxCheckRequest,
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    request: BoxCheckRequest
 ) -> dict:
     """
     Check if a box with specific dimensions exists in the library
@@ -1,10 +1,12 @@
 from typing import Tuple
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 
-from backend.lib.auth_middleware import get_current_auth
+from backend.lib.auth_middleware import get_current_auth, get_current_admin
+from backend.lib.store_params import StoreId
 from backend.lib.auth_manager import get_db
+from backend.lib.http_cache import json_response_with_etag
 from backend.lib.packing_rules_defaults import (
     get_default_rule, get_all_default_rules,
     get_default_engine_config, get_default_engine_config_value
@@ -13,24 +15,37 @@ from backend.models.packing import PackingRulesUpdateRequest, EngineConfigUpdate
 
 router = APIRouter(prefix="/api/store/{store_id}", tags=["packing"])
 
+# Read on every page load; explicit column lists fetch only what the handlers
+# use and keep the queries independent of schema additions
+_SQL_STORE_PACKING_RULES = '''
+    SELECT id, packing_type, padding_inches, wizard_description, label_instructions
+    FROM store_packing_rules
+    WHERE store_id = ?
+    ORDER BY packing_type
+'''
 
-@router.get("/packing-rules", response_class=JSONResponse)
-async def get_packing_rules(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    auth: Tuple[str, str] = Depends(get_current_auth())
-):
-    """Get all packing rules for a store (custom + defaults)"""
-    # Verify user has access to this store
-    if auth[0] != store_id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
+_SQL_STORE_PACKING_RULE = '''
+    SELECT padding_inches, wizard_description, label_instructions
+    FROM store_packing_rules
+    WHERE store_id = ?
+    AND packing_type = ?
+'''
+
+_SQL_STORE_ENGINE_CONFIG = '''
+    SELECT weight_price, weight_efficiency, weight_ease,
+           strategy_normal, strategy_prescored, strategy_flattened,
+           strategy_manual_cut, strategy_telescoping, strategy_cheating,
+           practically_tight_threshold, max_recommendations, extreme_cut_threshold
+    FROM store_engine_config
+    WHERE store_id = ?
+'''
+
+
+def _load_packing_rules(store_id: str) -> dict:
+    """Custom and effective (custom overriding defaults) packing rules for a store"""
     custom_rules = []
     with get_db() as db:
-        cursor = db.execute('''
-            SELECT * FROM store_packing_rules 
-            WHERE store_id = ? 
-            ORDER BY packing_type
-        ''', (store_id,))
+        cursor = db.execute(_SQL_STORE_PACKING_RULES, (store_id,))
         
         for row in cursor:
             custom_rules.append({
@@ -69,21 +84,28 @@ async def get_packing_rules(
     }
 
 
-@router.post("/packing-rules", response_class=JSONResponse)
+@router.get("/packing-rules", response_class=ORJSONResponse)
+async def get_packing_rules(
+    request: Request,
+    store_id: StoreId,
+    auth: Tuple[str, str] = Depends(get_current_auth())
+):
+    """Get all packing rules for a store (custom + defaults)"""
+    # Verify user has access to this store
+    if auth[0] != store_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return json_response_with_etag(request, _load_packing_rules(store_id))
+
+
+@router.post("/packing-rules", response_class=ORJSONResponse)
 async def update_packing_rules(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     request: PackingRulesUpdateRequest = Body(...),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Update packing rules for a store"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin permission
-    if auth_level != "admin":
-        raise HTTPException(
-            status_code=403,
-            detail="Admin access required"
-        )
+    auth_store_id, _ = auth_info
     
     # Check store access
     if auth_store_id != store_id:
@@ -125,20 +147,13 @@ async def update_packing_rules(
     return {'success': True, 'rules_updated': len(request.rules)}
 
 
-@router.delete("/packing-rules", response_class=JSONResponse)
+@router.delete("/packing-rules", response_class=ORJSONResponse)
 async def reset_packing_rules(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    store_id: StoreId,
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Reset all packing rules to defaults"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin permission
-    if auth_level != "admin":
-        raise HTTPException(
-            status_code=403,
-            detail="Admin access required"
-        )
+    auth_store_id, _ = auth_info
     
     # Check store access
     if auth_store_id != store_id:
@@ -154,9 +169,9 @@ async def reset_packing_rules(
     return {'success': True, 'message': 'Rules reset to defaults'}
 
 
-@router.get("/packing-requirements", response_class=JSONResponse)
+@router.get("/packing-requirements", response_class=ORJSONResponse)
 async def get_packing_requirements(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     type: str = Query(..., description="Packing type (Basic, Standard, Fragile, Custom)"),
     auth: Tuple[str, str] = Depends(get_current_auth())
 ):
@@ -167,11 +182,7 @@ async def get_packing_requirements(
     
     # First check for custom rule
     with get_db() as db:
-        cursor = db.execute('''
-            SELECT * FROM store_packing_rules 
-            WHERE store_id = ? 
-            AND packing_type = ?
-        ''', (store_id, type))
+        cursor = db.execute(_SQL_STORE_PACKING_RULE, (store_id, type))
         
         row = cursor.fetchone()
         if row:
@@ -190,22 +201,11 @@ async def get_packing_requirements(
     }
 
 
-@router.get("/engine-config", response_class=JSONResponse)
-async def get_engine_config(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    auth: Tuple[str, str] = Depends(get_current_auth())
-):
-    """Get recommendation engine configuration for a store"""
-    # Verify user has access to this store
-    if auth[0] != store_id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
+def _load_engine_config(store_id: str) -> dict:
+    """Recommendation engine configuration for a store (custom or defaults)"""
     # Check for custom config
     with get_db() as db:
-        cursor = db.execute('''
-            SELECT * FROM store_engine_config 
-            WHERE store_id = ?
-        ''', (store_id,))
+        cursor = db.execute(_SQL_STORE_ENGINE_CONFIG, (store_id,))
         
         row = cursor.fetchone()
         if row:
@@ -237,21 +237,28 @@ async def get_engine_config(
     }
 
 
-@router.post("/engine-config", response_class=JSONResponse)
+@router.get("/engine-config", response_class=ORJSONResponse)
+async def get_engine_config(
+    request: Request,
+    store_id: StoreId,
+    auth: Tuple[str, str] = Depends(get_current_auth())
+):
+    """Get recommendation engine configuration for a store"""
+    # Verify user has access to this store
+    if auth[0] != store_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return json_response_with_etag(request, _load_engine_config(store_id))
+
+
+@router.post("/engine-config", response_class=ORJSONResponse)
 async def update_engine_config(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    store_id: StoreId,
     request: EngineConfigUpdateRequest = Body(...),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Update recommendation engine configuration for a store"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin permission
-    if auth_level != "admin":
-        raise HTTPException(
-            status_code=403,
-            detail="Admin access required"
-        )
+    auth_store_id, _ = auth_info
     
     # Check store access
     if auth_store_id != store_id:
@@ -313,20 +320,13 @@ async def update_engine_config(
     return {'success': True, 'message': 'Engine configuration updated'}
 
 
-@router.delete("/engine-config", response_class=JSONResponse)
+@router.delete("/engine-config", response_class=ORJSONResponse)
 async def reset_engine_config(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
-    auth_info: Tuple[str, str] = Depends(get_current_auth())
+    store_id: StoreId,
+    auth_info: Tuple[str, str] = Depends(get_current_admin())
 ):
     """Reset engine configuration to defaults"""
-    auth_store_id, auth_level = auth_info
-    
-    # Check admin permission
-    if auth_level != "admin":
-        raise HTTPException(
-            status_code=403,
-            detail="Admin access required"
-        )
+    auth_store_id, _ = auth_info
     
     # Check store access
     if auth_store_id != store_id:
@@ -342,9 +342,10 @@ async def reset_engine_config(
     return {'success': True, 'message': 'Engine configuration reset to defaults'}
 
 
-@router.get("/packing-config", response_class=JSONResponse)
+@router.get("/packing-config", response_class=ORJSONResponse)
 async def get_packing_config(
-    store_id: str = Path(..., regex=r"^\d{1,6}$"),
+    request: Request,
+    store_id: StoreId,
     auth: Tuple[str, str] = Depends(get_current_auth())
 ):
     """Get combined packing rules and engine config for a store"""
@@ -353,12 +354,12 @@ async def get_packing_config(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Get packing rules
-    rules_response = await get_packing_rules(store_id, auth)
+    rules_response = _load_packing_rules(store_id)
     
     # Get engine config
-    engine_config = await get_engine_config(store_id, auth)
+    engine_config = _load_engine_config(store_id)
     
-    return {
+    return json_response_with_etag(request, {
         'rules': rules_response['effective_rules'],
         'engine_config': engine_config
-    }
\ No newline at end of file
+    })
\ No newline at end of file
@@ -13,6 +13,7 @@ Examples:
     ./tools/auth modify-email 1 newemail@example.com
     ./tools/auth verify 1
     ./tools/auth audit
+    ./tools/auth -y regenerate-pin 1     # no confirmation prompt
     
 Note: This tool should be run inside the Docker container. The convenience script
 ./tools/auth handles this automatically.
@@ -22,31 +23,35 @@ import sys
 import os
 import argparse
 import getpass
-from tabulate import tabulate
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.lib.auth_manager import (
-    init_db, create_store_auth, list_stores, 
-    get_audit_log, verify_pin, hasAuth,
-    get_store_info, regenerate_pin, update_email,
-    get_db
-)
-import bcrypt
+# backend.lib.auth_manager (bcrypt, sqlite3) and tabulate are imported inside
+# the commands that use them, so `--help` and argument errors stay fast
 import secrets
 
+def confirm(args, prompt: str, answer: str = 'y') -> bool:
+    """
+    Ask the user to confirm an action
+    
+    Returns True without prompting when -y/--yes (or the command's own
+    -f/--force) was given, so commands can run unattended in scripts.
+    """
+    if args.yes or getattr(args, 'force', False):
+        return True
+    return input(prompt).lower() == answer
+
 def cmd_init(args):
     """Initialize the database"""
+    from backend.lib.auth_manager import init_db
+    
     init_db()
     print("Database initialized successfully.")
 
-def cmd_create(args):
-    """Create store authentication"""
-    store_id = args.store
-    admin_email = args.email
-    
+def ensure_store_yaml(store_id: str) -> bool:
+    """Create a minimal stores/store{id}.yml if missing; False if that failed"""
     # Check if store YAML file exists
     yaml_path = Path(f"stores/store{store_id}.yml")
     if not yaml_path.exists():
@@ -91,12 +96,23 @@ boxes: []  # Add your box definitions here
             print("Please edit this file later to add your box inventory.")
         except Exception as e:
             print(f"Error creating store configuration: {e}")
-            return
+            return False
+    
+    return True
+
+def cmd_create(args):
+    """Create store authentication"""
+    from backend.lib.auth_manager import create_store_auth, hasAuth
+    
+    store_id = args.store
+    admin_email = args.email
+    
+    if not ensure_store_yaml(store_id):
+        return
     
     # Check if this store already has authentication
     if hasAuth(store_id):
-        response = input(f"Store {store_id} already has authentication. Update it? [y/N]: ")
-        if response.lower() != 'y':
+        if not confirm(args, f"Store {store_id} already has authentication. Update it? [y/N]: "):
             print("Aborted.")
             return
     
@@ -109,19 +125,78 @@ boxes: []  # Add your box definitions here
     print("\nIMPORTANT: Save this PIN! It cannot be recovered.")
     print("Share this PIN with store associates who need read-only access.")
 
+def cmd_bulk_create(args):
+    """Create store authentication for every store listed in a CSV file"""
+    import csv
+    from backend.lib.auth_manager import create_store_auth_bulk, hasAuth
+    from tabulate import tabulate
+    
+    # '-' reads stdin, which lets ./tools/auth take a file from the host
+    try:
+        if args.file == '-':
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(args.file, newline='') as f:
+                lines = f.read().splitlines()
+    except OSError as e:
+        print(f"Error reading {args.file}: {e}")
+        sys.exit(1)
+    
+    # Accept comma- or tab-separated files
+    dialect = 'excel-tab' if lines and '\t' in lines[0] else 'excel'
+    records = [row for row in csv.reader(lines, dialect) if row and row[0].strip()]
+    
+    # Optional header row
+    if records and records[0][0].strip().lower() in ('store', 'store_id'):
+        records = records[1:]
+    
+    rows = []
+    seen = set()
+    for line, record in enumerate(records, 1):
+        if len(record) < 2 or not record[1].strip():
+            print(f"Error: row {line} needs a store ID and an admin email: {record}")
+            sys.exit(1)
+        store_id, admin_email = record[0].strip(), record[1].strip()
+        if store_id in seen:
+            print(f"Error: store {store_id} is listed more than once.")
+            sys.exit(1)
+        seen.add(store_id)
+        rows.append((store_id, admin_email))
+    
+    if not rows:
+        print("No stores found in file.")
+        return
+    
+    existing = [store_id for store_id, _ in rows if hasAuth(store_id)]
+    if existing:
+        print(f"These stores already have authentication: {', '.join(existing)}")
+        if not confirm(args, "Update them? [y/N]: "):
+            print("Aborted.")
+            return
+    
+    for store_id, _ in rows:
+        if not ensure_store_yaml(store_id):
+            return
+    
+    created = create_store_auth_bulk(rows)
+    
+    print(f"\nAuthentication configured for {len(created)} stores\n")
+    print(tabulate(created, headers=['Store ID', 'Admin Email', 'User PIN'], tablefmt='plain', disable_numparse=True))
+    print("\nIMPORTANT: Save these PINs! They cannot be recovered.")
+
 def cmd_regenerate_pin(args):
     """Regenerate PIN for a store"""
+    from backend.lib.auth_manager import hasAuth, regenerate_pin
+    
     store_id = args.store
     
     if not hasAuth(store_id):
         print(f"Error: Store {store_id} does not have authentication configured.")
         return
     
-    if not args.force:
-        response = input(f"Regenerate PIN for Store {store_id}? This will invalidate the current PIN. [y/N]: ")
-        if response.lower() != 'y':
-            print("Aborted.")
-            return
+    if not confirm(args, f"Regenerate PIN for Store {store_id}? This will invalidate the current PIN. [y/N]: "):
+        print("Aborted.")
+        return
     
     new_pin = regenerate_pin(store_id)
     print(f"\nNew PIN for Store {store_id}: {new_pin}")
@@ -129,23 +204,24 @@ def cmd_regenerate_pin(args):
 
 def cmd_modify_email(args):
     """Modify admin email for a store"""
+    from backend.lib.auth_manager import get_store_info, update_email
+    
     store_id = args.store
     new_email = args.email
     
-    if not hasAuth(store_id):
+    # One lookup answers both "is auth configured?" and "what is the email?"
+    info = get_store_info(store_id)
+    if not info:
         print(f"Error: Store {store_id} does not have authentication configured.")
         return
     
-    # Get current info
-    info = get_store_info(store_id)
     current_email = info['admin_email']
     
-    if not args.force:
+    if not (args.yes or args.force):
         print(f"Current admin email for Store {store_id}: {current_email}")
-        response = input(f"Change admin email to {new_email}? [y/N]: ")
-        if response.lower() != 'y':
-            print("Aborted.")
-            return
+    if not confirm(args, f"Change admin email to {new_email}? [y/N]: "):
+        print("Aborted.")
+        return
     
     try:
         update_email(store_id, new_email)
@@ -158,7 +234,10 @@ def cmd_modify_email(args):
 
 def cmd_list(args):
     """List all stores with authentication"""
-    stores = list_stores()
+    from backend.lib.auth_manager import list_stores
+    from tabulate import tabulate
+    
+    stores = list_stores(limit=args.limit, offset=args.offset)
     
     if not stores:
         print("No stores have authentication configured.")
@@ -167,10 +246,9 @@ def cmd_list(args):
     # Format the data for tabulate
     table_data = []
     for store in stores:
-        info = get_store_info(store['store_id'])
         table_data.append([
             store['store_id'],
-            info['admin_email'] if info else 'N/A',
+            store['admin_email'],
             store['created_at'],
             store['updated_at']
         ])
@@ -180,21 +258,14 @@ def cmd_list(args):
 
 def cmd_verify(args):
     """Verify a store PIN"""
-    store_id = args.store
+    from backend.lib.auth_manager import verify_pin
     
-    if not hasAuth(store_id):
-        print(f"Store {store_id} does not have authentication configured.")
-        return
-    
-    # Get store info
-    info = get_store_info(store_id)
-    print(f"\nStore {store_id} Authentication:")
-    print(f"Admin Email: {info['admin_email']}")
-    print(f"Created: {info['created_at']}")
-    print(f"Updated: {info['updated_at']}")
+    store_id = args.store
     
-    # Prompt for PIN
-    pin = getpass.getpass("\nEnter PIN to verify: ")
+    # Prompt before touching the store so an unknown store, a store without
+    # auth and a wrong PIN all look (and take) the same: verify_pin runs a
+    # full bcrypt check in every case and only returns a boolean
+    pin = getpass.getpass(f"Enter PIN to verify for Store {store_id}: ")
     
     if verify_pin(store_id, pin):
         print("✓ PIN is correct")
@@ -204,7 +275,15 @@ def cmd_verify(args):
 
 def cmd_audit(args):
     """Show audit log"""
-    logs = get_audit_log(store_id=args.store, limit=args.limit)
+    from backend.lib.auth_manager import get_audit_log
+    from tabulate import tabulate
+    
+    if (args.before is None) != (args.before_id is None):
+        print("Error: --before and --before-id must be given together.")
+        sys.exit(1)
+    before = (args.before, args.before_id) if args.before is not None else None
+    
+    logs = get_audit_log(store_id=args.store, limit=args.limit, before=before)
     
     if not logs:
         print("No audit log entries found.")
@@ -222,27 +301,45 @@ def cmd_audit(args):
     
     headers = ['Timestamp', 'Store', 'Action', 'Details']
     print(tabulate(table_data, headers=headers, tablefmt='plain'))
+    
+    # A full page may have more entries behind it
+    if len(logs) == args.limit:
+        last = logs[-1]
+        print(f"\nNext page: --before '{last['timestamp']}' --before-id {last['id']}")
+
+# Superadmin queries, defined once for the commands below that share them,
+# with explicit column lists
+_SQL_SUPERADMIN_ID = "SELECT id FROM superadmins WHERE username = ?"
+_SQL_SUPERADMIN_TOTP = "SELECT id, totp_enabled FROM superadmins WHERE username = ?"
+_SQL_SUPERADMIN_STATUS = "SELECT username, totp_enabled, created_at, last_login FROM superadmins WHERE username = ?"
+_SQL_SUPERADMIN_LIST = """
+    SELECT username, created_at, last_login, totp_enabled 
+    FROM superadmins 
+    ORDER BY username
+"""
+_SQL_INSERT_SUPERADMIN = "INSERT INTO superadmins (username, password_hash) VALUES (?, ?)"
+_SQL_UPDATE_SUPERADMIN_PASSWORD = "UPDATE superadmins SET password_hash = ? WHERE username = ?"
+_SQL_CLEAR_SUPERADMIN_TOTP = "UPDATE superadmins SET totp_enabled = FALSE, totp_secret = NULL WHERE username = ?"
 
 def cmd_superadmin_create(args):
     """Create a new superadmin user"""
+    from backend.lib.auth_manager import get_db, hash_secret
+    
     username = args.username
     
     # Check if already exists
     with get_db() as db:
-        existing = db.execute("SELECT id FROM superadmins WHERE username = ?", (username,)).fetchone()
+        existing = db.execute(_SQL_SUPERADMIN_ID, (username,)).fetchone()
         if existing:
             print(f"Error: Superadmin '{username}' already exists!")
             sys.exit(1)
         
         # Generate secure password
         password = secrets.token_urlsafe(24)  # ~32 chars
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        password_hash = hash_secret(password)
         
         # Create superadmin
-        db.execute(
-            "INSERT INTO superadmins (username, password_hash) VALUES (?, ?)",
-            (username, password_hash)
-        )
+        db.execute(_SQL_INSERT_SUPERADMIN, (username, password_hash))
         db.commit()
         
         print(f"\n✅ Superadmin created successfully!")
@@ -253,30 +350,28 @@ def cmd_superadmin_create(args):
 
 def cmd_superadmin_reset_password(args):
     """Reset superadmin password"""
+    from backend.lib.auth_manager import get_db, hash_secret
+    
     username = args.username
     
     with get_db() as db:
         # Check if exists
-        existing = db.execute("SELECT id FROM superadmins WHERE username = ?", (username,)).fetchone()
+        existing = db.execute(_SQL_SUPERADMIN_ID, (username,)).fetchone()
         if not existing:
             print(f"Error: Superadmin '{username}' not found!")
             sys.exit(1)
         
         # Confirm reset
-        confirm = input(f"Reset password for superadmin '{username}'? (yes/no): ")
-        if confirm.lower() != 'yes':
+        if not confirm(args, f"Reset password for superadmin '{username}'? (yes/no): ", 'yes'):
             print("Cancelled.")
             return
         
         # Generate new password
         password = secrets.token_urlsafe(24)  # ~32 chars
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        password_hash = hash_secret(password)
         
         # Update password
-        db.execute(
-            "UPDATE superadmins SET password_hash = ? WHERE username = ?",
-            (password_hash, username)
-        )
+        db.execute(_SQL_UPDATE_SUPERADMIN_PASSWORD, (password_hash, username))
         db.commit()
         
         print(f"\n✅ Password reset successfully!")
@@ -286,12 +381,11 @@ def cmd_superadmin_reset_password(args):
 
 def cmd_superadmin_list(args):
     """List all superadmin users"""
+    from backend.lib.auth_manager import get_db
+    from tabulate import tabulate
+    
     with get_db() as db:
-        admins = db.execute("""
-            SELECT username, created_at, last_login, totp_enabled 
-            FROM superadmins 
-            ORDER BY username
-        """).fetchall()
+        admins = db.execute(_SQL_SUPERADMIN_LIST).fetchall()
         
         if not admins:
             print("No superadmin users found.")
@@ -310,11 +404,13 @@ def cmd_superadmin_list(args):
 
 def cmd_superadmin_disable_totp(args):
     """Disable TOTP for a superadmin user"""
+    from backend.lib.auth_manager import get_db
+    
     username = args.username
     
     with get_db() as db:
         # Check if exists
-        existing = db.execute("SELECT id, totp_enabled FROM superadmins WHERE username = ?", (username,)).fetchone()
+        existing = db.execute(_SQL_SUPERADMIN_TOTP, (username,)).fetchone()
         if not existing:
             print(f"Error: Superadmin '{username}' not found!")
             sys.exit(1)
@@ -324,16 +420,12 @@ def cmd_superadmin_disable_totp(args):
             return
         
         # Confirm action
-        confirm = input(f"Disable TOTP for superadmin '{username}'? (yes/no): ")
-        if confirm.lower() != 'yes':
+        if not confirm(args, f"Disable TOTP for superadmin '{username}'? (yes/no): ", 'yes'):
             print("Cancelled.")
             return
         
         # Disable TOTP
-        db.execute(
-            "UPDATE superadmins SET totp_enabled = FALSE, totp_secret = NULL WHERE username = ?",
-            (username,)
-        )
+        db.execute(_SQL_CLEAR_SUPERADMIN_TOTP, (username,))
         db.commit()
         
         print(f"\n✅ TOTP disabled for '{username}'")
@@ -341,26 +433,24 @@ def cmd_superadmin_disable_totp(args):
 
 def cmd_superadmin_reset_totp(args):
     """Reset TOTP for a superadmin user (disable and clear secret)"""
+    from backend.lib.auth_manager import get_db
+    
     username = args.username
     
     with get_db() as db:
         # Check if exists
-        existing = db.execute("SELECT id FROM superadmins WHERE username = ?", (username,)).fetchone()
+        existing = db.execute(_SQL_SUPERADMIN_ID, (username,)).fetchone()
         if not existing:
             print(f"Error: Superadmin '{username}' not found!")
             sys.exit(1)
         
         # Confirm action
-        confirm = input(f"Reset TOTP for superadmin '{username}'? This will disable 2FA. (yes/no): ")
-        if confirm.lower() != 'yes':
+        if not confirm(args, f"Reset TOTP for superadmin '{username}'? This will disable 2FA. (yes/no): ", 'yes'):
             print("Cancelled.")
             return
         
         # Reset TOTP
-        db.execute(
-            "UPDATE superadmins SET totp_enabled = FALSE, totp_secret = NULL WHERE username = ?",
-            (username,)
-        )
+        db.execute(_SQL_CLEAR_SUPERADMIN_TOTP, (username,))
         db.commit()
         
         print(f"\n✅ TOTP reset for '{username}'")
@@ -368,14 +458,13 @@ def cmd_superadmin_reset_totp(args):
 
 def cmd_superadmin_totp_status(args):
     """Check TOTP status for a superadmin user"""
+    from backend.lib.auth_manager import get_db
+    
     username = args.username
     
     with get_db() as db:
         # Get user info
-        admin = db.execute(
-            "SELECT username, totp_enabled, created_at, last_login FROM superadmins WHERE username = ?",
-            (username,)
-        ).fetchone()
+        admin = db.execute(_SQL_SUPERADMIN_STATUS, (username,)).fetchone()
         
         if not admin:
             print(f"Error: Superadmin '{username}' not found!")
@@ -395,6 +484,11 @@ def main():
     parser = argparse.ArgumentParser(
         description='Manage store authentication for Packing Website'
     )
+    parser.add_argument(
+        '-y', '--yes',
+        action='store_true',
+        help='Answer yes to all confirmation prompts (for scripted use)'
+    )
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
     # init command
@@ -410,6 +504,18 @@ def main():
     parser_create.add_argument('email', help='Admin email address')
     parser_create.set_defaults(func=cmd_create)
     
+    # bulk-create command
+    parser_bulk = subparsers.add_parser(
+        'bulk-create',
+        help='Create store authentication for many stores at once'
+    )
+    parser_bulk.add_argument(
+        '-f', '--file',
+        required=True,
+        help="CSV (or TSV) file of store_id,admin_email rows, or '-' for stdin"
+    )
+    parser_bulk.set_defaults(func=cmd_bulk_create)
+    
     # regenerate-pin command
     parser_regen = subparsers.add_parser(
         'regenerate-pin',
@@ -439,6 +545,17 @@ def main():
     
     # list command
     parser_list = subparsers.add_parser('list', help='List all stores with authentication')
+    parser_list.add_argument(
+        '-l', '--limit',
+        type=int,
+        help='Maximum number of stores to show (default: all)'
+    )
+    parser_list.add_argument(
+        '-o', '--offset',
+        type=int,
+        default=0,
+        help='Number of stores to skip (default: 0)'
+    )
     parser_list.set_defaults(func=cmd_list)
     
     # verify command
@@ -461,6 +578,17 @@ def main():
         default=50,
         help='Number of entries to show (default: 50)'
     )
+    parser_audit.add_argument(
+        '--before',
+        metavar='TIMESTAMP',
+        help='Only show entries older than this one (use with --before-id)'
+    )
+    parser_audit.add_argument(
+        '--before-id',
+        type=int,
+        metavar='ID',
+        help='Audit entry id paired with --before'
+    )
     parser_audit.set_defaults(func=cmd_audit)
     
     # superadmin subcommand